@@ -1,9 +1,90 @@
 import numpy as np
 from collections import deque
+from functools import lru_cache
 import heapq
+import time
+
+# Telemetría de la búsqueda en curso (la activa telemetria.run); None = sin instrumentar
+_TELEMETRY = None
+
+
+def _compile_model(transitions_model, num_states, num_actions, description=None):
+    """
+    Compila el diccionario P de gymnasium a una tabla densa de transiciones.
+
+    Devuelve (next_states, terminal):
+    - next_states: int32[num_states, num_actions] con el estado siguiente determinista
+      (primera transición con prob > 0) o -1 si la acción no tiene transición.
+    - terminal: bool[num_states], True para agujeros (H) y meta (G).
+    """
+    next_states = np.full((num_states, num_actions), -1, dtype=np.int32)
+    terminal = np.zeros(num_states, dtype=bool)
+
+    for state in range(num_states):
+        actions_model = transitions_model.get(state, {})
+        for action in range(num_actions):
+            for prob, next_state, _reward, done in actions_model.get(action, []):
+                if prob > 0:
+                    next_states[state, action] = next_state
+                    if done:
+                        terminal[next_state] = True
+                    break
+
+    # Con la descripción del mapa la máscara no depende de que el estado sea alcanzable
+    if description is not None:
+        cells = np.asarray(description).reshape(-1)
+        if cells.size == num_states:
+            targets = [b'H', b'G'] if cells.dtype.kind == 'S' else ['H', 'G']
+            terminal = np.isin(cells, targets)
+
+    return next_states, terminal
+
+
+def _compile_grid(description):
+    """
+    Compila la tabla de transiciones directamente desde la grilla (sin pasar por P).
+
+    Reproduce la semántica de FrozenLake determinista: moverse contra el borde deja al
+    agente en su celda y los estados terminales (H, G) sólo tienen auto-lazos.
+    Devuelve (next_states, terminal) con el mismo formato que _compile_model.
+    """
+    cells = np.asarray(description)
+    if cells.ndim == 1:
+        cells = np.asarray([list(row) for row in cells], dtype='S1')
+    n_rows, n_cols = cells.shape
+    hole, goal = (b'H', b'G') if cells.dtype.kind == 'S' else ('H', 'G')
+    terminal = ((cells == hole) | (cells == goal)).reshape(-1)
+
+    next_states = _grid_moves(n_rows, n_cols).copy()
+    next_states[terminal] = np.flatnonzero(terminal)[:, None]
+    return next_states, terminal
+
+
+@lru_cache(maxsize=4)
+def _grid_moves(n_rows, n_cols):
+    """
+    Tabla de transiciones de la grilla sin agujeros (sólo depende de la forma).
+
+    Se cachea porque armarla cuesta varias veces más que copiarla; es de sólo lectura.
+    """
+    rows, cols = np.divmod(np.arange(n_rows * n_cols), n_cols)
+    # FrozenLake: 0 LEFT, 1 DOWN, 2 RIGHT, 3 UP
+    moves = np.stack([
+        rows * n_cols + np.maximum(cols - 1, 0),
+        np.minimum(rows + 1, n_rows - 1) * n_cols + cols,
+        rows * n_cols + np.minimum(cols + 1, n_cols - 1),
+        np.maximum(rows - 1, 0) * n_cols + cols,
+    ], axis=1).astype(np.int32)
+    moves.flags.writeable = False
+    return moves
+
 
 def _env_model(env):
-    """Devuelve (transitions_model, n_rows, n_cols, description, num_actions) o None si no disponible."""
+    """
+    Devuelve (next_states, terminal, n_rows, n_cols, description, num_actions) o None si no disponible.
+
+    La tabla compilada se guarda en el entorno y se reutiliza mientras P no cambie.
+    """
     unwrapped_env = getattr(env, 'unwrapped', env)
     transitions_model = getattr(unwrapped_env, 'P', None)
     if transitions_model is None:
@@ -25,7 +106,20 @@ def _env_model(env):
             return None
 
     num_actions = getattr(env.action_space, 'n', 4)
-    return (transitions_model, n_rows, n_cols, description, num_actions)
+
+    cached = getattr(unwrapped_env, '_compiled_model', None)
+    if cached is not None and cached[0] is transitions_model:
+        _model_key, next_states, terminal = cached
+    else:
+        next_states, terminal = _compile_model(transitions_model, n_rows * n_cols, num_actions, description)
+        try:
+            unwrapped_env._compiled_model = (transitions_model, next_states, terminal)
+        except AttributeError:
+            pass
+
+    if _TELEMETRY is not None:
+        _TELEMETRY.mark('model')
+    return (next_states, terminal, n_rows, n_cols, description, num_actions)
 
 
 def _state_from_tuple(row_col, ncol):
@@ -37,15 +131,21 @@ def _find_in_desc(description, target_char):
     if description is None:
         return None
     # description suele ser array de bytes
-    n_rows, n_cols = description.shape
-    for row in range(n_rows):
-        for col in range(n_cols):
-            ch = description[row, col]
-            if isinstance(ch, (bytes, bytearray)):
-                ch = ch.decode()
-            if ch == target_char:
-                return (row, col)
-    return None
+    cells = np.asarray(description)
+    if cells.dtype == np.dtype('S1') and cells.ndim == 2:
+        # Comparar bytes como uint8 y tomar el primero con argmax es mucho más rápido que
+        # argwhere sobre la comparación de strings S1
+        mask = cells.view(np.uint8).reshape(-1) == ord(target_char)
+        index = int(mask.argmax())
+        if not mask[index]:
+            return None
+        return divmod(index, cells.shape[1])
+    target = target_char.encode() if cells.dtype.kind == 'S' else target_char
+    hits = np.argwhere(cells == target)
+    if hits.size == 0:
+        return None
+    row, col = hits[0]
+    return (int(row), int(col))
 
 
 def _normalize_start_goal(env, start, goal, description, ncol):
@@ -73,35 +173,273 @@ def _normalize_start_goal(env, start, goal, description, ncol):
     return start_state, goal_state
 
 
-def _deterministic_next_state(transitions_model, state, action):
-    transitions = transitions_model.get(state, {}).get(action, [])
-    if not transitions:
+def _deterministic_next_state(next_states, state, action):
+    next_state = int(next_states[state, action])
+    if next_state < 0:
         return None
-    for prob, next_state, _reward, _done in transitions:
-        if prob > 0:
-            return next_state
-    return None
+    return next_state
 
 
-def _successors(transitions_model, state, num_actions):
-    """Genera pares (action, next_state) para un estado dado en entorno determinista."""
-    for action in range(num_actions):
-        next_state = _deterministic_next_state(transitions_model, state, action)
-        if next_state is not None:
+def _successors(successors_table, state):
+    """Genera pares (action, next_state) para un estado dado a partir de la tabla compilada (como listas)."""
+    for action, next_state in enumerate(successors_table[state]):
+        if next_state >= 0:
             yield action, next_state
 
 
 def _reconstruct_actions(parent, parent_action, end_state):
-    """Reconstruye la secuencia de acciones desde el inicio hasta end_state."""
+    """
+    Reconstruye la secuencia de acciones desde el inicio hasta end_state.
+
+    Acepta diccionarios (parent[inicio] = None) o arreglos compactos (parent[inicio] = -1).
+    """
     actions = []
     cur_state = end_state
-    while parent.get(cur_state) is not None:
-        actions.append(parent_action[cur_state])
-        cur_state = parent[cur_state]
+    if isinstance(parent, np.ndarray):
+        while parent[cur_state] >= 0:
+            actions.append(int(parent_action[cur_state]))
+            cur_state = int(parent[cur_state])
+    else:
+        while parent.get(cur_state) is not None:
+            actions.append(parent_action[cur_state])
+            cur_state = parent[cur_state]
     actions.reverse()
     return actions
 
 
+def _reverse_index(next_states):
+    """
+    Índice inverso de transiciones en formato CSR.
+
+    Los predecesores de t son sources[offsets[t]:offsets[t+1]], alcanzando t con
+    actions[offsets[t]:offsets[t+1]]. Se omiten los auto-lazos (bordes y estados terminales).
+    """
+    num_states, num_actions = next_states.shape
+    targets = next_states.ravel()
+    positions = np.flatnonzero((targets >= 0) & (targets != np.arange(targets.size) // num_actions))
+    targets = targets[positions]
+    order = np.argsort(targets, kind='stable')
+    positions = positions[order]
+
+    offsets = np.zeros(num_states + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=num_states), out=offsets[1:])
+    return offsets, positions // num_actions, positions % num_actions
+
+
+def _steps_to(next_states, goal_state):
+    """
+    Pasos mínimos desde cada estado hasta goal_state (int32, _COST_INF si no la alcanza):
+    BFS hacia atrás por niveles sobre _reverse_index, cada capa con un gather de NumPy.
+    """
+    offsets, sources, _actions = _reverse_index(next_states)
+    degrees = np.diff(offsets)
+    steps = np.full(next_states.shape[0], _COST_INF, dtype=np.int32)
+    steps[goal_state] = 0
+    frontier = np.array([goal_state], dtype=np.int64)
+    level = 0
+    while frontier.size:
+        level += 1
+        counts = degrees[frontier]
+        first = np.cumsum(counts) - counts
+        predecessors = sources[np.repeat(offsets[frontier] - first, counts) + np.arange(counts.sum())]
+        frontier = np.unique(predecessors[steps[predecessors] == _COST_INF])
+        steps[frontier] = level
+    return steps
+
+
+def _forward_actions(child, child_action, start_state):
+    """Acciones desde start_state hasta la meta siguiendo los enlaces child de una búsqueda hacia atrás."""
+    actions = []
+    cur_state = start_state
+    while child.get(cur_state) is not None:
+        actions.append(child_action[cur_state])
+        cur_state = child[cur_state]
+    return actions
+
+
+class _HeapFrontier:
+    """Frontera sobre heapq: entradas (prioridad, ...) ordenadas por la tupla completa."""
+
+    def __init__(self):
+        self._heap = []
+
+    def push(self, entry):
+        heapq.heappush(self._heap, entry)
+
+    def pop(self):
+        return heapq.heappop(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class _BucketFrontier:
+    """
+    Cola de baldes (algoritmo de Dial) para prioridades enteras pequeñas.
+
+    Un balde por valor de prioridad y un cursor en el balde mínimo. Con prioridades
+    monótonas (UCS, o A* con heurística consistente) sólo hay unos pocos baldes vivos,
+    así que push y pop son O(1) amortizado. Prioridades no monótonas (push por debajo del
+    cursor) también son correctas, sólo más lentas. Dentro de un balde se desempata LIFO.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._cursor = 0
+        self._size = 0
+
+    def push(self, entry):
+        priority = entry[0]
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            self._buckets[priority] = [entry]
+        else:
+            bucket.append(entry)
+        if priority < self._cursor:
+            self._cursor = priority
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop de una frontera vacía")
+        bucket = self._buckets.get(self._cursor)
+        if bucket is None:
+            # Saltar directo al menor balde vivo (tolera huecos grandes entre prioridades)
+            self._cursor = min(self._buckets)
+            bucket = self._buckets[self._cursor]
+        self._size -= 1
+        entry = bucket.pop()
+        # Nunca quedan baldes vacíos: un push por debajo del cursor lo mueve y el balde
+        # abandonado no debe parecer vivo cuando min() vuelva a buscar
+        if not bucket:
+            del self._buckets[self._cursor]
+        return entry
+
+    def __len__(self):
+        return self._size
+
+
+def _make_frontier(kind, scenario):
+    """
+    kind='bucket' usa _BucketFrontier, 'heap' usa heapq.
+    'auto' elige baldes cuando los costos son enteros chicos (escenarios 1 y 2) y heapq si no.
+    """
+    if kind == 'auto':
+        kind = 'bucket' if scenario in (1, 2) else 'heap'
+    if kind == 'bucket':
+        return _BucketFrontier()
+    if kind == 'heap':
+        return _HeapFrontier()
+    raise ValueError(f"Frontera no reconocida: {kind}. Use: auto, heap, bucket")
+
+
+# Modo compacto: ~10 bytes por estado en lugar de las ~100+ de sets/dicts.
+_COST_INF = np.iinfo(np.int32).max
+
+
+def _compact_parents(num_states):
+    """Arreglos parent (int32, -1 = sin padre) y parent_action (int8) indexados por estado."""
+    parent = np.full(num_states, -1, dtype=np.int32)
+    parent_action = np.full(num_states, -1, dtype=np.int8)
+    return parent, parent_action
+
+
+def _bitset(num_states):
+    return np.zeros((num_states + 7) >> 3, dtype=np.uint8)
+
+
+def _bitset_test(bits, state):
+    return bits[state >> 3] & (1 << (state & 7))
+
+
+def _bitset_add(bits, state):
+    bits[state >> 3] |= 1 << (state & 7)
+
+
+def _bfs_compact(next_states, start_state, goal_state):
+    """BFS equivalente a bfs() pero con visitados en bitset y padres en arreglos."""
+    visited_bits = _bitset(next_states.shape[0])
+    parent, parent_action = _compact_parents(next_states.shape[0])
+    _bitset_add(visited_bits, start_state)
+    queue = deque([start_state])
+    expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    while queue:
+        current_state = queue.popleft()
+        expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(queue), telemetry.generated + 1)
+        if current_state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
+            return _reconstruct_actions(parent, parent_action, goal_state), expanded
+        for action, next_state in enumerate(next_states[current_state].tolist()):
+            if next_state < 0:
+                continue
+            if not _bitset_test(visited_bits, next_state):
+                _bitset_add(visited_bits, next_state)
+                parent[next_state] = current_state
+                parent_action[next_state] = action
+                queue.append(next_state)
+                if telemetry is not None:
+                    telemetry.generated += 1
+            elif telemetry is not None:
+                telemetry.duplicates += 1
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    return [], expanded
+
+
+def _best_first_compact(next_states, start_state, goal_state, step_cost, heuristic, heap):
+    """Núcleo de ucs()/astar() en modo compacto: best_cost int32 y padres en arreglos."""
+    best_cost = np.full(next_states.shape[0], _COST_INF, dtype=np.int32)
+    parent, parent_action = _compact_parents(next_states.shape[0])
+    best_cost[start_state] = 0
+    heap.push((heuristic(start_state), 0, start_state))  # (f, g, state)
+    expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+        seen = 1  # estados con best_cost finito (el arreglo no lleva la cuenta)
+
+    while heap:
+        _f_cost, g_cost, state = heap.pop()
+        if g_cost > best_cost[state]:
+            if telemetry is not None:
+                telemetry.stale_pops += 1
+            continue
+        expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(heap), seen)
+        if state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
+            return _reconstruct_actions(parent, parent_action, state), expanded
+
+        for action, next_state in enumerate(next_states[state].tolist()):
+            if next_state < 0:
+                continue
+            new_cost = g_cost + step_cost(action)
+            if new_cost < best_cost[next_state]:
+                if telemetry is not None:
+                    telemetry.generated += 1
+                    seen += best_cost[next_state] == _COST_INF
+                best_cost[next_state] = new_cost
+                parent[next_state] = state
+                parent_action[next_state] = action
+                heap.push((new_cost + heuristic(next_state), new_cost, next_state))
+            elif telemetry is not None:
+                telemetry.duplicates += 1
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    return [], expanded
+
+
 def _step_cost(action, scenario):
     """Costo por acción según escenario especificado."""
     if scenario == 1:
@@ -109,12 +447,27 @@ def _step_cost(action, scenario):
     # FrozenLake mapping: 0:LEFT, 1:DOWN, 2:RIGHT, 3:UP
     return 1 if action in (0, 2) else 10
 
+
+def _manhattan_heuristic(target_state, n_cols, scenario):
+    """Heurística Manhattan hacia target_state, ponderada por el costo de cada eje en el escenario 2."""
+    target_row, target_col = divmod(target_state, n_cols)
+
+    def heuristic(state):
+        row, col = divmod(state, n_cols)
+        dx = abs(col - target_col)
+        dy = abs(row - target_row)
+        if scenario == 1:
+            return dx + dy
+        return dx * 1 + dy * 10
+
+    return heuristic
+
 def random_search(env, start=None, goal=None, max_steps=10000):
 
     model = _env_model(env)
     if model is None:
         return [], 0
-    transitions_model, _n_rows, n_cols, description, num_actions = model
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
 
     start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
     if start_state is None or goal_state is None:
@@ -124,27 +477,38 @@ def random_search(env, start=None, goal=None, max_steps=10000):
     state = start_state
     actions = []
     expanded = 1  # cuenta el estado inicial
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+        telemetry.expand(0, 0)
 
     for _ in range(max_steps):
         if state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
             return actions, expanded
         # Elegir una acción al azar entre las posibles
         action = int(rng.integers(low=0, high=num_actions))
-        next_state = _deterministic_next_state(transitions_model, state, action)
+        next_state = _deterministic_next_state(next_states, state, action)
         if next_state is None:
             # si acción inválida, intenta otra sin penalizar expansión
             continue
         actions.append(action)
         state = next_state
         expanded += 1
+        if telemetry is not None:
+            telemetry.generated += 1
+            telemetry.expand(0, 0)
 
+    if telemetry is not None:
+        telemetry.mark('search')
     # No se alcanzó el objetivo dentro de max_steps
     if state == goal_state:
         return actions, expanded
     return [], expanded
 
 
-def bfs(env, start, goal):
+def bfs(env, start, goal, compact=False):
     """
     Búsqueda por Anchura (BFS) sobre el grafo de estados del entorno.
 
@@ -155,43 +519,59 @@ def bfs(env, start, goal):
     - env: entorno FrozenLake (determinista, is_slippery=False recomendado)
     - start: entero (estado) o tupla (fila, col) o None para detectar desde el entorno
     - goal: entero (estado) o tupla (fila, col) o None para detectar desde el entorno
+    - compact: usar arreglos int32/int8 y bitset en lugar de sets/dicts (mapas muy grandes)
     """
 
     model = _env_model(env)
     if model is None:
         return [], 0
-    transitions_model, _n_rows, n_cols, description, num_actions = model
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
 
     start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
 
     if start_state is None or goal_state is None:
         return [], 0
 
+    if compact:
+        return _bfs_compact(next_states, start_state, goal_state)
+
+    successors_table = next_states.tolist()
+
     # BFS (minimiza número de acciones)
     queue = deque([start_state])
     visited_states = set([start_state])
     parent = {start_state: None}
     parent_action = {start_state: None}
     expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
 
     found_goal = False
     while queue:
         current_state = queue.popleft()
         expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(queue), len(visited_states))
         if current_state == goal_state:
             found_goal = True
             break
         # Expandir sucesores deterministas (is_slippery=False => una transición por acción)
-        for action in range(num_actions):
-            next_state = _deterministic_next_state(transitions_model, current_state, action)
-            if next_state is None:
+        for action, next_state in enumerate(successors_table[current_state]):
+            if next_state < 0:
                 continue
             if next_state not in visited_states:
                 visited_states.add(next_state)
                 parent[next_state] = current_state
                 parent_action[next_state] = action
                 queue.append(next_state)
+                if telemetry is not None:
+                    telemetry.generated += 1
+            elif telemetry is not None:
+                telemetry.duplicates += 1
 
+    if telemetry is not None:
+        telemetry.mark('search')
     if not found_goal:
         return [], expanded
 
@@ -199,25 +579,104 @@ def bfs(env, start, goal):
     return _reconstruct_actions(parent, parent_action, goal_state), expanded
 
 
+def bfs_vectorized(env, start, goal):
+    """
+    BFS sincronizada por niveles: cada capa completa se genera con un gather de NumPy
+    sobre la tabla compilada (next_states[frontier]).
+
+    Los duplicados de la capa se resuelven quedándose con la primera aparición en orden
+    (estado de la frontera, acción), igual que la cola FIFO de bfs(), por lo que devuelve
+    el mismo camino y la misma cantidad de expansiones.
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+
+    num_states = next_states.shape[0]
+    visited = np.zeros(num_states, dtype=bool)
+    parent, parent_action = _compact_parents(num_states)
+    visited[start_state] = True
+    frontier = np.array([start_state], dtype=np.int64)
+    expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+        seen = 1
+
+    while frontier.size:
+        hit = np.flatnonzero(frontier == goal_state)
+        if hit.size:
+            expanded += int(hit[0]) + 1
+            if telemetry is not None:
+                telemetry.expand(frontier.size, seen, count=int(hit[0]) + 1)
+                telemetry.mark('search')
+            return _reconstruct_actions(parent, parent_action, goal_state), expanded
+        expanded += frontier.size
+        if telemetry is not None:
+            telemetry.expand(frontier.size, seen, count=frontier.size)
+
+        candidates = next_states[frontier].ravel()
+        valid = candidates >= 0
+        num_candidates = int(valid.sum())
+        valid[valid] = ~visited[candidates[valid]]
+        positions = np.flatnonzero(valid)
+        if positions.size == 0:
+            if telemetry is not None:
+                telemetry.duplicates += num_candidates
+            break
+
+        # Primera aparición de cada estado nuevo, en orden de descubrimiento
+        _unique, first = np.unique(candidates[positions], return_index=True)
+        positions = positions[np.sort(first)]
+        new_states = candidates[positions].astype(np.int64)
+
+        parent[new_states] = frontier[positions // num_actions]
+        parent_action[new_states] = positions % num_actions
+        visited[new_states] = True
+        frontier = new_states
+        if telemetry is not None:
+            telemetry.generated += new_states.size
+            telemetry.duplicates += num_candidates - new_states.size
+            seen += new_states.size
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    return [], expanded
+
+
 def dfs(env, start, goal):
     """Búsqueda en Profundidad (DFS) iterativa con pila. Devuelve lista de acciones o []."""
     model = _env_model(env)
     if model is None:
         return [], 0
-    transitions_model, _n_rows, n_cols, description, num_actions = model
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
 
     start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
     if start_state is None or goal_state is None:
         return [], 0
 
+    successors_table = next_states.tolist()
+
     stack = [(start_state, 0, [])]  # (state, next_action_idx, path_actions)
     on_current_path = set([start_state])
     expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
 
     while stack:
         state, next_action_idx, path_actions = stack.pop()
         expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(stack), len(on_current_path))
         if state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
             return path_actions, expanded
         if next_action_idx >= num_actions:
             on_current_path.discard(state)
@@ -227,12 +686,18 @@ def dfs(env, start, goal):
 
         # Expandir un sucesor determinista correspondiente a next_action_idx
         action = next_action_idx
-        next_state = _deterministic_next_state(transitions_model, state, action)
-        if next_state is None or next_state in on_current_path:
+        next_state = successors_table[state][action]
+        if next_state < 0 or next_state in on_current_path:
+            if telemetry is not None and next_state >= 0:
+                telemetry.duplicates += 1
             continue
         on_current_path.add(next_state)
         stack.append((next_state, 0, path_actions + [action]))
+        if telemetry is not None:
+            telemetry.generated += 1
 
+    if telemetry is not None:
+        telemetry.mark('search')
     return [], expanded
 
 
@@ -241,12 +706,14 @@ def dls(env, start, goal, limit=50):
     model = _env_model(env)
     if model is None:
         return [], 0
-    transitions_model, _n_rows, n_cols, description, num_actions = model
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
 
     start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
     if start_state is None or goal_state is None:
         return [], 0
 
+    successors_table = next_states.tolist()
+
     # Pila para simulación iterativa del backtracking: (state, next_action_idx, path_actions)
     stack = [(start_state, 0, [])]
 
@@ -254,13 +721,20 @@ def dls(env, start, goal, limit=50):
     visited = set([start_state])
 
     expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
 
     while stack:
         state, next_action_idx, path_actions = stack.pop()
         expanded += 1  # mantenemos la misma convención que tu versión original
+        if telemetry is not None:
+            telemetry.expand(len(stack), len(visited))
 
         # Objetivo alcanzado
         if state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
             return path_actions, expanded
 
         # Corte por límite o por acciones agotadas en este estado
@@ -272,32 +746,40 @@ def dls(env, start, goal, limit=50):
 
         # Generar el sucesor determinista para la acción actual
         action = next_action_idx
-        next_state = _deterministic_next_state(transitions_model, state, action)
-        if next_state is None:
+        next_state = successors_table[state][action]
+        if next_state < 0:
             continue
 
         # Conjunto GLOBAL de visitados: si ya se descubrió ese estado, no lo volvemos a apilar
         if next_state in visited:
+            if telemetry is not None:
+                telemetry.duplicates += 1
             continue
 
         visited.add(next_state)
         stack.append((next_state, 0, path_actions + [action]))
+        if telemetry is not None:
+            telemetry.generated += 1
 
+    if telemetry is not None:
+        telemetry.mark('search')
     # No se encontró solución dentro del límite
     return [], expanded
 
 
-def ucs(env, start, goal, scenario=1):
+def ucs(env, start, goal, scenario=1, compact=False, frontier='auto'):
     """
     Búsqueda de Costo Uniforme (UCS/Dijkstra).
     - scenario=1: costo de cada acción = 1 (equivale a BFS en óptimo de pasos).
     - scenario=2: LEFT/RIGHT=1, DOWN/UP=10.
+    - compact: padres/costos en arreglos int32/int8 indexados por estado.
+    - frontier: 'auto', 'bucket' (cola de Dial) o 'heap' (heapq).
     Devuelve la lista de acciones óptima o [].
     """
     model = _env_model(env)
     if model is None:
         return [], 0
-    transitions_model, _n_rows, n_cols, description, num_actions = model
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
 
     start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
     if start_state is None or goal_state is None:
@@ -306,18 +788,34 @@ def ucs(env, start, goal, scenario=1):
     def step_cost(action):
         return _step_cost(action, scenario)
 
-    heap = [(0, start_state)]
+    heap = _make_frontier(frontier, scenario)
+
+    if compact:
+        return _best_first_compact(next_states, start_state, goal_state, step_cost, lambda _state: 0, heap)
+
+    successors_table = next_states.tolist()
+
+    heap.push((0, start_state))
     best_cost = {start_state: 0}
     parent = {start_state: None}
     parent_action = {start_state: None}
     expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
 
     while heap:
-        g_cost, state = heapq.heappop(heap)
+        g_cost, state = heap.pop()
         if g_cost > best_cost.get(state, float('inf')):
+            if telemetry is not None:
+                telemetry.stale_pops += 1
             continue
         expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(heap), len(best_cost))
         if state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
             actions = []
             cur_state = state
             while parent[cur_state] is not None:
@@ -326,28 +824,38 @@ def ucs(env, start, goal, scenario=1):
             actions.reverse()
             return actions, expanded
 
-        for action, next_state in _successors(transitions_model, state, num_actions):
+        for action, next_state in _successors(successors_table, state):
             new_cost = g_cost + step_cost(action)
             if new_cost < best_cost.get(next_state, float('inf')):
                 best_cost[next_state] = new_cost
                 parent[next_state] = state
                 parent_action[next_state] = action
-                heapq.heappush(heap, (new_cost, next_state))
-
+                heap.push((new_cost, next_state))
+                if telemetry is not None:
+                    telemetry.generated += 1
+            elif telemetry is not None:
+                telemetry.duplicates += 1
+
+    if telemetry is not None:
+        telemetry.mark('search')
     return [], expanded
 
 
-def astar(env, start, goal, scenario=1):
+def astar(env, start, goal, scenario=1, compact=False, frontier='auto', heuristic=None):
     """
     Búsqueda A* con heurística admisible basada en distancia Manhattan.
     - scenario=1: h = |dx| + |dy|
     - scenario=2: h = |dx|*1 + |dy|*10 (L/R barato, U/D caro)
+    - compact: padres/costos en arreglos int32/int8 indexados por estado.
+    - frontier: 'auto', 'bucket' (cola de Dial) o 'heap' (heapq).
+    - heuristic: función estado -> cota entera del costo a la meta (p. ej. un campo de
+      distancias); por defecto Manhattan del escenario.
     Devuelve la lista de acciones óptima o [].
     """
     model = _env_model(env)
     if model is None:
         return [], 0
-    transitions_model, _n_rows, n_cols, description, num_actions = model
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
 
     start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
     if start_state is None or goal_state is None:
@@ -356,28 +864,37 @@ def astar(env, start, goal, scenario=1):
     def step_cost(action):
         return _step_cost(action, scenario)
 
-    goal_row, goal_col = divmod(goal_state, n_cols)
+    if heuristic is None:
+        heuristic = _manhattan_heuristic(goal_state, n_cols, scenario)
 
-    def heuristic(state):
-        row, col = divmod(state, n_cols)
-        dx = abs(col - goal_col)
-        dy = abs(row - goal_row)
-        if scenario == 1:
-            return dx + dy
-        return dx * 1 + dy * 10
+    heap = _make_frontier(frontier, scenario)
+
+    if compact:
+        return _best_first_compact(next_states, start_state, goal_state, step_cost, heuristic, heap)
+
+    successors_table = next_states.tolist()
 
-    heap = [(heuristic(start_state), 0, start_state)]  # (f, g, state)
+    heap.push((heuristic(start_state), 0, start_state))  # (f, g, state)
     best_cost = {start_state: 0}
     parent = {start_state: None}
     parent_action = {start_state: None}
     expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
 
     while heap:
-        f_cost, g_cost, state = heapq.heappop(heap)
+        f_cost, g_cost, state = heap.pop()
         if g_cost > best_cost.get(state, float('inf')):
+            if telemetry is not None:
+                telemetry.stale_pops += 1
             continue
         expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(heap), len(best_cost))
         if state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
             actions = []
             cur_state = state
             while parent[cur_state] is not None:
@@ -386,12 +903,898 @@ def astar(env, start, goal, scenario=1):
             actions.reverse()
             return actions, expanded
 
-        for action, next_state in _successors(transitions_model, state, num_actions):
+        for action, next_state in _successors(successors_table, state):
             new_cost = g_cost + step_cost(action)
             if new_cost < best_cost.get(next_state, float('inf')):
                 best_cost[next_state] = new_cost
                 parent[next_state] = state
                 parent_action[next_state] = action
-                heapq.heappush(heap, (new_cost + heuristic(next_state), new_cost, next_state))
+                heap.push((new_cost + heuristic(next_state), new_cost, next_state))
+                if telemetry is not None:
+                    telemetry.generated += 1
+            elif telemetry is not None:
+                telemetry.duplicates += 1
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    return [], expanded
+
+
+def ara_star(env, start, goal, scenario=1, budget_ms=None, weight=3.0, weight_step=0.5, on_improvement=None):
+    """
+    ARA* (A* anytime con peso decreciente) con presupuesto de tiempo opcional.
+
+    Empieza como A* ponderado con f = g + weight * h, que encuentra rápido un camino
+    subóptimo, y va bajando el peso de a weight_step hasta 1. Entre rondas conserva g y los
+    padres: los estados mejorados después de cerrarse pasan a INCONS y sólo ellos (más la
+    frontera) se reabren, en lugar de empezar de cero. Cada ronda terminada que baja el
+    costo o la cota lo informa con on_improvement(actions, costo, cota, segundos), donde
+    cota acota costo / costo óptimo (1.0 = óptimo demostrado). Al vencer budget_ms devuelve el mejor
+    camino de las rondas terminadas ([] si ninguna terminó).
+    Devuelve (acciones, expandidos en total).
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+
+    def step_cost(action):
+        return _step_cost(action, scenario)
+
+    heuristic = _manhattan_heuristic(goal_state, n_cols, scenario)
+    successors_table = next_states.tolist()
+    inf = float('inf')
+    inicio = time.perf_counter()
+    deadline = inicio + budget_ms / 1000.0 if budget_ms is not None else None
+
+    best_cost = {start_state: 0}
+    parent = {start_state: None}
+    parent_action = {start_state: None}
+    open_key = {}    # estado -> clave vigente en open_heap
+    open_heap = []   # (g + weight * h, g, estado)
+    closed = set()
+    incons = set()   # mejorados después de cerrarse en esta ronda
+    best_actions = []
+    best_total = inf
+    best_bound = inf
+    expanded = 0
+    telemetry = _TELEMETRY
+
+    def push(state):
+        key = best_cost[state] + weight * heuristic(state)
+        open_key[state] = key
+        heapq.heappush(open_heap, (key, best_cost[state], state))
+
+    def improve_path():
+        """Expande hasta que ninguna clave de OPEN sea menor que g(meta). False si venció el tiempo."""
+        nonlocal expanded
+        while open_heap:
+            key, _g_cost, state = open_heap[0]
+            if open_key.get(state) != key:
+                heapq.heappop(open_heap)
+                if telemetry is not None:
+                    telemetry.stale_pops += 1
+                continue
+            if best_cost.get(goal_state, inf) <= key:
+                return True
+            heapq.heappop(open_heap)
+            del open_key[state]
+            closed.add(state)
+            expanded += 1
+            if telemetry is not None:
+                telemetry.expand(len(open_key), len(best_cost))
+            if deadline is not None and expanded % 256 == 0 and time.perf_counter() > deadline:
+                return False
+
+            g_cost = best_cost[state]
+            for action, next_state in _successors(successors_table, state):
+                new_cost = g_cost + step_cost(action)
+                if new_cost < best_cost.get(next_state, inf):
+                    best_cost[next_state] = new_cost
+                    parent[next_state] = state
+                    parent_action[next_state] = action
+                    if next_state in closed:
+                        incons.add(next_state)
+                    else:
+                        push(next_state)
+                    if telemetry is not None:
+                        telemetry.generated += 1
+                elif telemetry is not None:
+                    telemetry.duplicates += 1
+        return True
+
+    push(start_state)
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    while True:
+        if not improve_path():
+            break
+        goal_cost = best_cost.get(goal_state, inf)
+        if goal_cost < inf:
+            # Cota de suboptimalidad: g(meta) / min(g + h) sobre OPEN e INCONS
+            pending = [best_cost[state] + heuristic(state) for state in list(open_key) + list(incons)]
+            lower_bound = min(pending) if pending else goal_cost
+            bound = max(1.0, min(weight, goal_cost / lower_bound)) if lower_bound > 0 else 1.0
+            if goal_cost < best_total or bound < best_bound:
+                if goal_cost < best_total:
+                    best_total = goal_cost
+                    best_actions = _reconstruct_actions(parent, parent_action, goal_state)
+                best_bound = bound
+                if on_improvement is not None:
+                    on_improvement(best_actions, best_total, bound, time.perf_counter() - inicio)
+        if weight <= 1.0 or not (open_key or incons):
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        weight = max(1.0, weight - weight_step)
+        for state in incons:
+            open_key[state] = None
+        incons.clear()
+        closed.clear()
+        open_heap = []
+        for state in open_key:
+            push(state)
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    return best_actions, expanded
+
+
+def beam_search(env, start, goal, scenario=1, width=1000, stats=None):
+    """
+    Beam search por capas con memoria acotada: cada capa se expande completa con un gather
+    next_states[capa] y de sus sucesores sólo quedan los width de menor f = g + h.
+
+    Dentro de la capa los duplicados se resuelven quedándose con el de menor g; entre capas,
+    un estado sólo vuelve a entrar si llega con g menor que cuando se lo guardó. Por capa se
+    guardan el índice del padre y la acción, así la memoria es O(width × profundidad). Corta
+    cuando ningún estado del haz puede mejorar el mejor camino a la meta.
+
+    Al podar, el haz puede perder el camino óptimo o todos los caminos. Si stats es un dict
+    se completa con pruned (se descartó algún estado por el ancho), may_be_suboptimal (el
+    costo devuelto supera el menor f descartado), may_be_incomplete (no hubo camino pero se
+    podó), layers y peak_width. Devuelve (acciones, expandidos).
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+
+    goal_row, goal_col = divmod(goal_state, n_cols)
+    row_cost = 1 if scenario == 1 else 10  # Manhattan ponderada, como _manhattan_heuristic
+
+    def heuristic(states):
+        rows, cols = np.divmod(states, n_cols)
+        return np.abs(cols - goal_col) + row_cost * np.abs(rows - goal_row)
+
+    action_cost = np.array([_step_cost(action, scenario) for action in range(num_actions)], dtype=np.int64)
+    inf = float('inf')
+
+    states = np.array([start_state], dtype=np.int64)
+    costs = np.zeros(1, dtype=np.int64)
+    best_cost = {start_state: 0}
+    layer_parents = []  # layer_parents[k][i]: índice del padre en la capa k del estado i de la capa k + 1
+    layer_actions = []
+    best_total = 0 if start_state == goal_state else inf
+    best_end = None     # (capa, índice en la capa, acción) del último paso a la meta
+    pruned_f = inf      # menor f descartado por el ancho del haz
+    expanded = 0
+    peak_width = 1
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    while states.size and (costs + heuristic(states)).min() < best_total:
+        expanded += states.size
+        if telemetry is not None:
+            telemetry.expand(states.size, len(best_cost), count=states.size)
+
+        successors = next_states[states].ravel().astype(np.int64)
+        g = (costs[:, None] + action_cost).ravel()
+        valid = (successors >= 0) & (successors != np.repeat(states, num_actions))
+        valid[valid] = ~terminal[successors[valid]] | (successors[valid] == goal_state)
+
+        at_goal = np.flatnonzero(valid & (successors == goal_state))
+        if at_goal.size:
+            position = int(at_goal[np.argmin(g[at_goal])])
+            if g[position] < best_total:
+                best_total = int(g[position])
+                best_end = (len(layer_parents), position // num_actions, position % num_actions)
+            valid[at_goal] = False
+
+        # Duplicados de la capa: por estado, el de menor g (y en empate, el primero generado)
+        positions = np.flatnonzero(valid)
+        positions = positions[np.lexsort((positions, g[positions], successors[positions]))]
+        first = np.ones(positions.size, dtype=bool)
+        first[1:] = successors[positions[1:]] != successors[positions[:-1]]
+        num_candidates = positions.size
+        positions = positions[first]
+        # Duplicados entre capas: sólo si mejoran el g guardado
+        improves = [cost < best_cost.get(state, inf)
+                    for state, cost in zip(successors[positions].tolist(), g[positions].tolist())]
+        positions = positions[np.array(improves, dtype=bool)]
+        f = g[positions] + heuristic(successors[positions])
+        useful = f < best_total
+        positions, f = positions[useful], f[useful]
+        if telemetry is not None:
+            telemetry.duplicates += num_candidates - positions.size
+
+        if positions.size > width:
+            order = np.lexsort((positions, f))
+            pruned_f = min(pruned_f, int(f[order[width]]))
+            positions = np.sort(positions[order[:width]])
+
+        states = successors[positions]
+        costs = g[positions]
+        best_cost.update(zip(states.tolist(), costs.tolist()))
+        layer_parents.append((positions // num_actions).astype(np.int32))
+        layer_actions.append((positions % num_actions).astype(np.int8))
+        peak_width = max(peak_width, states.size)
+        if telemetry is not None:
+            telemetry.generated += states.size
+
+    found = best_total < inf
+    if stats is not None:
+        stats.update({
+            "pruned": pruned_f < inf,
+            "may_be_suboptimal": found and best_total > pruned_f,
+            "may_be_incomplete": not found and pruned_f < inf,
+            "layers": len(layer_parents),
+            "peak_width": peak_width,
+        })
+    if telemetry is not None:
+        telemetry.mark('search')
+    if best_end is None:
+        return [], expanded
+
+    layer, index, action = best_end
+    actions = [action]
+    for parents, layer_action in zip(reversed(layer_parents[:layer]), reversed(layer_actions[:layer])):
+        actions.append(int(layer_action[index]))
+        index = int(parents[index])
+    actions.reverse()
+    return actions, expanded
+
+
+def _walkable_mask(description, terminal, goal_state):
+    """Celdas transitables según desc (todo menos H); sin desc, los no terminales más la meta."""
+    if description is not None:
+        cells = np.asarray(description).reshape(-1)
+        hole = b'H' if cells.dtype.kind == 'S' else 'H'
+        return cells != hole
+    walkable = ~terminal
+    walkable[goal_state] = True
+    return walkable
+
+
+def jps(env, start, goal, frontier='auto'):
+    """
+    Jump Point Search para grillas 4-conectadas con costo uniforme (Escenario 1).
+
+    Orden canónico "vertical primero": un tramo horizontal sólo gira cuando aparece un
+    vecino forzado (celda arriba/abajo libre cuyo par en la columna anterior estaba
+    bloqueado); un tramo vertical lanza saltos horizontales en cada celda y se detiene
+    donde alguno encuentra un punto de salto. A* sólo expande puntos de salto y las
+    acciones intermedias se reconstruyen al final. Para Escenario 2 el camino minimiza
+    pasos, no costo (como bfs()).
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+
+    successors_table = next_states.tolist()
+    walkable = _walkable_mask(description, terminal, goal_state).tolist()
+    heuristic = _manhattan_heuristic(goal_state, n_cols, 1)
+    opposite = {0: 2, 1: 3, 2: 0, 3: 1}
+
+    def open_cell(state, action):
+        next_state = successors_table[state][action]
+        return next_state >= 0 and next_state != state and walkable[next_state]
+
+    def forced_turns(state, action):
+        """Giros verticales forzados al llegar a state moviéndose horizontalmente con action."""
+        prev_state = successors_table[state][opposite[action]]
+        return [side for side in (1, 3) if open_cell(state, side) and not open_cell(prev_state, side)]
+
+    def jump(state, action):
+        while open_cell(state, action):
+            state = successors_table[state][action]
+            if state == goal_state:
+                return state
+            if action in (0, 2):
+                if forced_turns(state, action):
+                    return state
+            elif jump(state, 0) is not None or jump(state, 2) is not None:
+                return state
+        return None
+
+    heap = _make_frontier(frontier, 1)
+    heap.push((heuristic(start_state), 0, start_state))
+    best_cost = {start_state: 0}
+    parent = {start_state: None}
+    parent_action = {start_state: None}
+    expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    found_goal = False
+    while heap:
+        _f_cost, g_cost, state = heap.pop()
+        if g_cost > best_cost[state]:
+            if telemetry is not None:
+                telemetry.stale_pops += 1
+            continue
+        expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(heap), len(best_cost))
+        if state == goal_state:
+            found_goal = True
+            break
+
+        arrived = parent_action[state]
+        if arrived is None:
+            directions = list(range(num_actions))
+        elif arrived in (0, 2):
+            directions = [arrived] + forced_turns(state, arrived)
+        else:
+            directions = [arrived, 0, 2]
+
+        row, col = divmod(state, n_cols)
+        for action in directions:
+            jump_state = jump(state, action)
+            if jump_state is None:
+                continue
+            jump_row, jump_col = divmod(jump_state, n_cols)
+            new_cost = g_cost + abs(jump_row - row) + abs(jump_col - col)
+            if new_cost < best_cost.get(jump_state, float('inf')):
+                best_cost[jump_state] = new_cost
+                parent[jump_state] = state
+                parent_action[jump_state] = action
+                heap.push((new_cost + heuristic(jump_state), new_cost, jump_state))
+                if telemetry is not None:
+                    telemetry.generated += 1
+            elif telemetry is not None:
+                telemetry.duplicates += 1
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    if not found_goal:
+        return [], expanded
+
+    # Expandir cada salto en sus movimientos unitarios
+    actions = []
+    cur_state = goal_state
+    while parent[cur_state] is not None:
+        prev_state = parent[cur_state]
+        steps = abs(cur_state - prev_state)
+        if parent_action[cur_state] in (1, 3):
+            steps //= n_cols
+        actions.extend([parent_action[cur_state]] * steps)
+        cur_state = prev_state
+    actions.reverse()
+    return actions, expanded
+
+
+def bidirectional_bfs(env, start, goal):
+    """
+    BFS bidireccional: avanza por capas desde S (sucesores) y desde G (predecesores del
+    índice inverso), expandiendo siempre la frontera más chica. Al cruzarse elige el punto
+    de encuentro con menor distancia total, por lo que minimiza el número de pasos igual que bfs().
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+    if start_state == goal_state:
+        return [], 1
+
+    successors_table = next_states.tolist()
+    offsets, pred_states, pred_actions = (arr.tolist() for arr in _reverse_index(next_states))
+
+    parent = {start_state: None}
+    parent_action = {start_state: None}
+    dist_forward = {start_state: 0}
+    child = {goal_state: None}
+    child_action = {goal_state: None}
+    dist_backward = {goal_state: 0}
+    frontier_forward = [start_state]
+    frontier_backward = [goal_state]
+    expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    while frontier_forward and frontier_backward:
+        meet_state = None
+        best_total = None
+        next_layer = []
+        if telemetry is not None:
+            telemetry.expand(len(frontier_forward) + len(frontier_backward), len(parent) + len(child),
+                             count=min(len(frontier_forward), len(frontier_backward)))
+        if len(frontier_forward) <= len(frontier_backward):
+            for state in frontier_forward:
+                expanded += 1
+                for action, next_state in enumerate(successors_table[state]):
+                    if next_state < 0 or next_state in parent:
+                        if telemetry is not None and next_state >= 0:
+                            telemetry.duplicates += 1
+                        continue
+                    parent[next_state] = state
+                    parent_action[next_state] = action
+                    dist_forward[next_state] = dist_forward[state] + 1
+                    next_layer.append(next_state)
+                    if next_state in dist_backward:
+                        total = dist_forward[next_state] + dist_backward[next_state]
+                        if best_total is None or total < best_total:
+                            meet_state, best_total = next_state, total
+            frontier_forward = next_layer
+        else:
+            for state in frontier_backward:
+                expanded += 1
+                for idx in range(offsets[state], offsets[state + 1]):
+                    prev_state = pred_states[idx]
+                    if prev_state in child:
+                        if telemetry is not None:
+                            telemetry.duplicates += 1
+                        continue
+                    child[prev_state] = state
+                    child_action[prev_state] = pred_actions[idx]
+                    dist_backward[prev_state] = dist_backward[state] + 1
+                    next_layer.append(prev_state)
+                    if prev_state in dist_forward:
+                        total = dist_forward[prev_state] + dist_backward[prev_state]
+                        if best_total is None or total < best_total:
+                            meet_state, best_total = prev_state, total
+            frontier_backward = next_layer
+        if telemetry is not None:
+            telemetry.generated += len(next_layer)
+
+        if meet_state is not None:
+            if telemetry is not None:
+                telemetry.mark('search')
+            return (_reconstruct_actions(parent, parent_action, meet_state)
+                    + _forward_actions(child, child_action, meet_state)), expanded
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    return [], expanded
+
+
+def bidirectional_astar(env, start, goal, scenario=1):
+    """
+    A* bidireccional con heurísticas Manhattan hacia G (adelante) y hacia S (atrás).
+
+    En el sentido inverso cada arista cuesta lo mismo que la acción original, así que el
+    escenario 2 (L/R=1, U/D=10) se respeta. mu es el mejor costo de camino encontrado al
+    cruzarse las búsquedas; como ambas heurísticas son consistentes, cualquier camino aún no
+    visto cuesta al menos el f mínimo de cada cola, y se corta cuando alguno de ellos es >= mu.
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+    if start_state == goal_state:
+        return [], 1
+
+    def step_cost(action):
+        return _step_cost(action, scenario)
+
+    heuristic_forward = _manhattan_heuristic(goal_state, n_cols, scenario)
+    heuristic_backward = _manhattan_heuristic(start_state, n_cols, scenario)
+
+    successors_table = next_states.tolist()
+    offsets, pred_states, pred_actions = (arr.tolist() for arr in _reverse_index(next_states))
+
+    heap_forward = [(heuristic_forward(start_state), 0, start_state)]
+    heap_backward = [(heuristic_backward(goal_state), 0, goal_state)]
+    cost_forward = {start_state: 0}
+    cost_backward = {goal_state: 0}
+    parent = {start_state: None}
+    parent_action = {start_state: None}
+    child = {goal_state: None}
+    child_action = {goal_state: None}
+    best_total = float('inf')
+    meet_state = None
+    expanded = 0
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    while heap_forward and heap_backward:
+        if max(heap_forward[0][0], heap_backward[0][0]) >= best_total:
+            break
+
+        if len(heap_forward) <= len(heap_backward):
+            _f_cost, g_cost, state = heapq.heappop(heap_forward)
+            if g_cost > cost_forward[state]:
+                if telemetry is not None:
+                    telemetry.stale_pops += 1
+                continue
+            expanded += 1
+            if telemetry is not None:
+                telemetry.expand(len(heap_forward) + len(heap_backward), len(cost_forward) + len(cost_backward))
+            for action, next_state in _successors(successors_table, state):
+                new_cost = g_cost + step_cost(action)
+                if new_cost < cost_forward.get(next_state, float('inf')):
+                    cost_forward[next_state] = new_cost
+                    parent[next_state] = state
+                    parent_action[next_state] = action
+                    heapq.heappush(heap_forward, (new_cost + heuristic_forward(next_state), new_cost, next_state))
+                    if telemetry is not None:
+                        telemetry.generated += 1
+                    if next_state in cost_backward and new_cost + cost_backward[next_state] < best_total:
+                        best_total = new_cost + cost_backward[next_state]
+                        meet_state = next_state
+                elif telemetry is not None:
+                    telemetry.duplicates += 1
+        else:
+            _f_cost, g_cost, state = heapq.heappop(heap_backward)
+            if g_cost > cost_backward[state]:
+                if telemetry is not None:
+                    telemetry.stale_pops += 1
+                continue
+            expanded += 1
+            if telemetry is not None:
+                telemetry.expand(len(heap_forward) + len(heap_backward), len(cost_forward) + len(cost_backward))
+            for idx in range(offsets[state], offsets[state + 1]):
+                prev_state = pred_states[idx]
+                action = pred_actions[idx]
+                new_cost = g_cost + step_cost(action)
+                if new_cost < cost_backward.get(prev_state, float('inf')):
+                    cost_backward[prev_state] = new_cost
+                    child[prev_state] = state
+                    child_action[prev_state] = action
+                    heapq.heappush(heap_backward, (new_cost + heuristic_backward(prev_state), new_cost, prev_state))
+                    if telemetry is not None:
+                        telemetry.generated += 1
+                    if prev_state in cost_forward and new_cost + cost_forward[prev_state] < best_total:
+                        best_total = new_cost + cost_forward[prev_state]
+                        meet_state = prev_state
+                elif telemetry is not None:
+                    telemetry.duplicates += 1
+
+    if telemetry is not None:
+        telemetry.mark('search')
+    if meet_state is None:
+        return [], expanded
+    return (_reconstruct_actions(parent, parent_action, meet_state)
+            + _forward_actions(child, child_action, meet_state)), expanded
+
+
+def ida_star(env, start, goal, scenario=1, table_size=1 << 16):
+    """
+    IDA*: profundización iterativa sobre el umbral f = g + h con la heurística Manhattan
+    del escenario. Óptimo para ambos escenarios y con memoria O(profundidad).
+
+    table_size acota una tabla de transposición por iteración (estado -> mejor g visto con
+    el umbral actual): volver a un estado con g no mejor se poda, lo que evita explorar
+    los caminos simétricos de la grilla sin superar esa cantidad de entradas.
+
+    expanded cuenta, como en astar, los nodos cuyos sucesores se generan (sumando todas
+    las iteraciones). Si una iteración no dejó fuera del umbral ningún estado que no haya
+    alcanzado (y la tabla no se llenó), la componente de start ya está recorrida entera y
+    sin la meta: devuelve [] sin seguir subiendo el umbral.
+    """
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+
+    def step_cost(action):
+        return _step_cost(action, scenario)
+
+    heuristic = _manhattan_heuristic(goal_state, n_cols, scenario)
+    successors_table = next_states.tolist()
+
+    if start_state == goal_state:
+        return [], 1
+
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    expanded = 0
+    bound = heuristic(start_state)
+    while True:
+        next_bound = float('inf')
+        path = [start_state]
+        path_costs = [0]
+        path_actions = []
+        next_action = [0]
+        on_path = {start_state}
+        transpositions = {start_state: 0}
+        # Estados cortados por el umbral que no estaban en la tabla al cortarlos
+        outside = set()
+        expanded += 1
+        if telemetry is not None:
+            telemetry.expand(0, 1)
+
+        while path:
+            state = path[-1]
+            if next_action[-1] >= num_actions:
+                on_path.discard(state)
+                path.pop()
+                path_costs.pop()
+                next_action.pop()
+                if path_actions:
+                    path_actions.pop()
+                continue
+
+            action = next_action[-1]
+            next_action[-1] += 1
+            next_state = successors_table[state][action]
+            if next_state < 0 or next_state in on_path:
+                if telemetry is not None and next_state >= 0:
+                    telemetry.duplicates += 1
+                continue
+
+            new_cost = path_costs[-1] + step_cost(action)
+            f_cost = new_cost + heuristic(next_state)
+            if f_cost > bound:
+                next_bound = min(next_bound, f_cost)
+                if next_state not in transpositions:
+                    outside.add(next_state)
+                continue
+            if transpositions.get(next_state, float('inf')) <= new_cost:
+                if telemetry is not None:
+                    telemetry.duplicates += 1
+                continue
+            if next_state in transpositions or len(transpositions) < table_size:
+                transpositions[next_state] = new_cost
+
+            if telemetry is not None:
+                telemetry.generated += 1
+            if next_state == goal_state:
+                if telemetry is not None:
+                    telemetry.mark('search')
+                return path_actions + [action], expanded
+
+            expanded += 1
+            if telemetry is not None:
+                # IDA* no tiene frontera: se registra el largo del camino y la tabla de transposición
+                telemetry.expand(len(path) + 1, len(transpositions))
+            path.append(next_state)
+            path_costs.append(new_cost)
+            path_actions.append(action)
+            next_action.append(0)
+            on_path.add(next_state)
+
+        # Con la tabla sin llenar, todo estado alcanzado quedó en ella y se expandió: si los
+        # cortados también están, subir el umbral sólo recorrería los mismos estados
+        closed = len(transpositions) < table_size and all(state in transpositions for state in outside)
+        if next_bound == float('inf') or closed:
+            if telemetry is not None:
+                telemetry.mark('search')
+            return [], expanded
+        bound = next_bound
+
+
+class _MemoryNode:
+    """Nodo del árbol de SMA*: forgotten guarda el f respaldado de cada hijo olvidado."""
+
+    __slots__ = ('state', 'g', 'f', 'depth', 'parent', 'action', 'children', 'forgotten', 'open_key', 'alive')
+
+    def __init__(self, state, g, f, parent=None, action=None):
+        self.state = state
+        self.g = g
+        self.f = f
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.parent = parent
+        self.action = action
+        self.children = {}
+        self.forgotten = None  # None = todavía no expandido
+        self.open_key = None
+        self.alive = True
+
+
+def sma_star(env, start, goal, scenario=1, max_nodes=100000):
+    """
+    SMA* simplificado: A* sobre un árbol con a lo sumo max_nodes nodos en memoria.
+
+    Se expande el nodo de menor f (el más profundo en empates) y, al llenarse la memoria,
+    se olvida la hoja de mayor f (la menos profunda en empates); su f se respalda en el
+    padre, que vuelve a la frontera para regenerarla si hace falta. El f de cada nodo
+    expandido es el mínimo de los de sus hijos, vivos u olvidados.
+
+    Un nodo que no es la meta y cuya profundidad más los pasos mínimos hasta ella pasa de
+    max_nodes - 1 (en particular, uno a profundidad max_nodes - 1, o uno desde el que la
+    meta no se alcanza) no puede llevar a la meta sin pasarse de memoria y queda con
+    f = inf. Los pasos mínimos salen de una BFS hacia atrás desde la meta (_steps_to): un
+    int32 por estado, como la tabla compilada, fuera de la cuenta de max_nodes. Un sucesor cuyo estado ya está en memoria con g y profundidad no
+    peores se anota como olvidado con f = inf: todo lo que se alcanza por él se alcanza
+    por el otro nodo. Es óptimo siempre que el camino óptimo quepa en max_nodes; si no (o
+    si no hay camino), el f respaldado de la raíz llega a inf y devuelve [].
+    """
+    if max_nodes < 1:
+        raise ValueError("max_nodes debe ser al menos 1")
+
+    model = _env_model(env)
+    if model is None:
+        return [], 0
+    next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+
+    start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+    if start_state is None or goal_state is None:
+        return [], 0
+
+    def step_cost(action):
+        return _step_cost(action, scenario)
+
+    heuristic = _manhattan_heuristic(goal_state, n_cols, scenario)
+    steps_to_goal = _steps_to(next_states, goal_state).tolist()
+    successors_table = next_states.tolist()
+    inf = float('inf')
+
+    root = _MemoryNode(start_state, 0, heuristic(start_state))
+    live = {start_state: root}
+    open_heap = []  # (f, -depth, id, node): mejor f, más profundo
+    leaf_heap = []  # (-f, depth, id, node): peor f, menos profundo
+    counter = 0
+    memory = 1
+    expanded = 0
+
+    def push_open(node, key):
+        nonlocal counter
+        node.open_key = key
+        counter += 1
+        heapq.heappush(open_heap, (key, -node.depth, counter, node))
+
+    def push_leaf(node):
+        nonlocal counter
+        counter += 1
+        heapq.heappush(leaf_heap, (-node.f, node.depth, counter, node))
+
+    def reopen(node):
+        """Vuelve a poner node en la frontera si tiene hijos olvidados por regenerar."""
+        key = min(node.forgotten.values(), default=inf)
+        if key < inf and (node.open_key is None or key < node.open_key):
+            push_open(node, key)
+
+    def backup(node):
+        while node is not None:
+            best = min(min((child.f for child in node.children.values()), default=inf),
+                       min(node.forgotten.values(), default=inf))
+            if best == node.f:
+                break
+            node.f = best
+            if not node.children:
+                push_leaf(node)
+            node = node.parent
+
+    def forget(node):
+        nonlocal memory
+        node.alive = False
+        memory -= 1
+        if live.get(node.state) is node:
+            del live[node.state]
+        parent = node.parent
+        del parent.children[node.action]
+        parent.forgotten[node.action] = node.f
+        reopen(parent)
+        if not parent.children:
+            push_leaf(parent)
+
+    def valid_leaf(entry):
+        leaf = entry[3]
+        return leaf.alive and not leaf.children and leaf.parent is not None and -entry[0] == leaf.f
+
+    def compact(heap, valid):
+        heap[:] = [entry for entry in heap if valid(entry)]
+        heapq.heapify(heap)
+
+    push_open(root, root.f)
+    telemetry = _TELEMETRY
+    if telemetry is not None:
+        telemetry.mark('setup')
+
+    while open_heap and root.f < inf:
+        key, _depth, _id, node = heapq.heappop(open_heap)
+        if not node.alive or key != node.open_key:
+            if telemetry is not None:
+                telemetry.stale_pops += 1
+            continue
+        node.open_key = None
+
+        if node.state == goal_state:
+            if telemetry is not None:
+                telemetry.mark('search')
+            actions = []
+            while node.parent is not None:
+                actions.append(node.action)
+                node = node.parent
+            actions.reverse()
+            return actions, expanded
+
+        expanded += 1
+        if telemetry is not None:
+            telemetry.expand(len(open_heap), memory)
+        if node.depth + steps_to_goal[node.state] >= max_nodes:
+            # El camino desde la raíz hasta la meta pasando por node no cabe en memoria
+            candidates = []
+        elif node.forgotten is None:
+            candidates = [(action, -inf) for action in range(num_actions)]
+        else:
+            candidates = [(action, backed_f) for action, backed_f in node.forgotten.items() if backed_f < inf]
+        node.forgotten = {}
+
+        best_child = None
+        for action, backed_f in candidates:
+            next_state = successors_table[node.state][action]
+            if next_state < 0 or next_state == node.state:
+                continue
+            new_cost = node.g + step_cost(action)
+            other = live.get(next_state)
+            if other is not None and other.g <= new_cost and other.depth <= node.depth + 1:
+                node.forgotten[action] = inf
+                if telemetry is not None:
+                    telemetry.duplicates += 1
+                continue
+            child = _MemoryNode(next_state, new_cost,
+                                max(new_cost + heuristic(next_state), backed_f, node.f), node, action)
+            node.children[action] = child
+            live[next_state] = child
+            memory += 1
+            push_open(child, child.f)
+            push_leaf(child)
+            if best_child is None or child.f < best_child.f:
+                best_child = child
+            if telemetry is not None:
+                telemetry.generated += 1
+
+        backup(node)
+        # Ramas muertas (f = inf sin hijos vivos): se olvidan enseguida
+        while node.parent is not None and node.f == inf and not node.children:
+            parent = node.parent
+            forget(node)
+            node = parent
+
+        # Se olvidan las peores hojas salvo el mejor hijo recién generado, que es el que
+        # se expande a continuación; el camino hasta él siempre cabe por el corte de profundidad
+        kept = False
+        while memory > max_nodes and leaf_heap:
+            entry = heapq.heappop(leaf_heap)
+            if not valid_leaf(entry):
+                continue
+            if entry[3] is best_child:
+                kept = True
+                continue
+            forget(entry[3])
+        if kept:
+            push_leaf(best_child)
+
+        if len(open_heap) > 4 * max_nodes + 16:
+            compact(open_heap, lambda entry: entry[3].alive and entry[0] == entry[3].open_key)
+        if len(leaf_heap) > 4 * max_nodes + 16:
+            compact(leaf_heap, valid_leaf)
 
+    if telemetry is not None:
+        telemetry.mark('search')
     return [], expanded
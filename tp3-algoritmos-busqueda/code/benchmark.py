@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import algoritmos
+from distancias import map_key
+from experimentos import CeldaTimeout, _time_limit
+from grilla import GridEnv
+from randomCustom import generate_random_map_np
+
+SIZES = (8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+DENSITIES = (0.92, 0.8)
+
+# (etiqueta, función de algoritmos.py, kwargs), como CELDAS de experimentos.py
+ALGORITMOS = [
+    ("BFS", "bfs", {}),
+    ("UCS[E1]", "ucs", {"scenario": 1}),
+    ("A*[E1]", "astar", {"scenario": 1}),
+    ("UCS[E2]", "ucs", {"scenario": 2}),
+    ("A*[E2]", "astar", {"scenario": 2}),
+]
+
+# Sólo con --algoritmos: DFS puede recorrer todo el mapa antes de llegar a G y en los
+# tamaños grandes la memoria crece sin que el timeout (SIGALRM) alcance a cortarlo
+ALGORITMOS_OPCIONALES = [
+    ("DFS", "dfs", {}),
+]
+
+# Para la pendiente log-log se descartan los mapas chicos, dominados por costos fijos
+MIN_STATES_FIT = 64 * 64
+
+
+def _result_key(label, size, p):
+    return f"{label}|{size}|{p}"
+
+
+def build_maps(size, p, seed, count):
+    """
+    count mapas fijos para (size, p): cada uno sale de un Generator sembrado con
+    (seed, size, p, i), así el mismo mapa se repite entre corridas y máquinas.
+    """
+    envs = []
+    for index in range(count):
+        rng = np.random.default_rng([seed, size, round(p * 1000), index])
+        desc, next_states, terminal = generate_random_map_np(size, p, rng)
+        envs.append(GridEnv(desc, compiled=(next_states, terminal)))
+    return envs
+
+
+def _quartiles(values):
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    return float(median), float(q3 - q1)
+
+
+def bench_cell(label, algoritmo, kwargs, envs, repeats, warmup, timeout):
+    """
+    Corre un algoritmo sobre los mapas de un (size, p): warmup corridas sin medir y repeats
+    medidas por mapa. Cada corrida tiene su propio timeout; si alguna lo supera la celda
+    queda como "timeout". Devuelve el resultado con mediana e IQR de tiempo y expandidos
+    sobre todas las corridas, más la mediana de tiempo de cada mapa (map_times).
+    """
+    if repeats < 1:
+        raise ValueError(f"repeats debe ser al menos 1 (recibido {repeats})")
+    if not envs:
+        raise ValueError("No hay mapas para medir")
+    search = getattr(algoritmos, algoritmo)
+    times = []
+    expansions = []
+    map_times = []
+    solved = 0
+    try:
+        for env in envs:
+            first = len(times)
+            for run in range(warmup + repeats):
+                with _time_limit(timeout):
+                    inicio = time.perf_counter()
+                    actions, expanded = search(env, start=None, goal=None, **kwargs)
+                    fin = time.perf_counter()
+                if run < warmup:
+                    continue
+                times.append(fin - inicio)
+                expansions.append(expanded)
+            map_times.append(float(np.median(times[first:])))
+            solved += bool(actions)
+    except CeldaTimeout:
+        return {"status": "timeout"}
+
+    time_median, time_iqr = _quartiles(times)
+    expanded_median, expanded_iqr = _quartiles(expansions)
+    return {
+        "status": "ok",
+        "time_median": time_median,
+        "time_iqr": time_iqr,
+        "expanded_median": expanded_median,
+        "expanded_iqr": expanded_iqr,
+        "map_times": map_times,
+        "runs": len(times),
+        "solved": solved,
+    }
+
+
+def run_suite(sizes, densities, algorithms, maps, repeats, warmup, seed, timeout, verbose=True):
+    """
+    Recorre la grilla (densidad, tamaño, algoritmo) de menor a mayor tamaño. Un algoritmo
+    que superó el timeout en un tamaño no se corre en los siguientes de esa densidad.
+    """
+    results = []
+    for p in densities:
+        timed_out = set()
+        for size in sorted(sizes):
+            envs = build_maps(size, p, seed, maps)
+            fingerprints = [map_key(env) for env in envs]
+            for label, algoritmo, kwargs in algorithms:
+                if label in timed_out:
+                    cell = {"status": "skipped"}
+                else:
+                    cell = bench_cell(label, algoritmo, kwargs, envs, repeats, warmup, timeout)
+                    if cell["status"] == "timeout":
+                        timed_out.add(label)
+                cell.update({"algorithm": label, "size": size, "p": p, "states": size * size,
+                             "maps": fingerprints})
+                results.append(cell)
+                if verbose:
+                    print(_format_cell(cell), flush=True)
+    return results
+
+
+def _format_cell(cell):
+    head = f"{cell['algorithm']:<8} size={cell['size']:<5} p={cell['p']:<5}"
+    if cell["status"] != "ok":
+        return f"{head} {cell['status']}"
+    return (f"{head} tiempo {cell['time_median'] * 1000:10.3f} ms (IQR {cell['time_iqr'] * 1000:.3f})"
+            f"  expandidos {cell['expanded_median']:12.0f} (IQR {cell['expanded_iqr']:.0f})")
+
+
+def scaling_slopes(results):
+    """
+    Pendiente de log(tiempo) y log(expandidos) contra log(estados) por (algoritmo, p),
+    ajustada sobre los mapas de al menos MIN_STATES_FIT estados: ~1 es lineal en el tamaño
+    del mapa, ~2 cuadrática.
+    """
+    series = {}
+    for cell in results:
+        if cell["status"] == "ok" and cell["states"] >= MIN_STATES_FIT:
+            series.setdefault((cell["algorithm"], cell["p"]), []).append(cell)
+    slopes = {}
+    for (label, p), cells in series.items():
+        if len(cells) < 2:
+            continue
+        states = np.log([cell["states"] for cell in cells])
+        time_slope = np.polyfit(states, np.log([cell["time_median"] for cell in cells]), 1)[0]
+        expanded_slope = np.polyfit(states, np.log([max(cell["expanded_median"], 1.0) for cell in cells]), 1)[0]
+        slopes[f"{label}|{p}"] = {"time": float(time_slope), "expanded": float(expanded_slope)}
+    return slopes
+
+
+def compare(results, baseline, threshold, min_time):
+    """
+    Regresiones contra baseline: celdas cuyo tiempo creció más que threshold (fracción) y
+    por encima de min_time segundos, que ahora dan timeout, o cuyos expandidos cambiaron
+    (mismo mapa y algoritmo determinista: cambió el comportamiento). El aumento es la
+    mediana de los cocientes mapa a mapa, para que la diferencia entre mapas no tape el
+    cambio. Las celdas con otros mapas (otra versión de numpy) no se comparan.
+    """
+    previous = {_result_key(cell["algorithm"], cell["size"], cell["p"]): cell for cell in baseline["results"]}
+    regressions = []
+    for cell in results:
+        key = _result_key(cell["algorithm"], cell["size"], cell["p"])
+        old = previous.get(key)
+        if old is None or old["status"] != "ok" or old.get("maps") != cell["maps"]:
+            continue
+        if cell["status"] == "timeout":
+            regressions.append(f"{key}: timeout (antes {old['time_median'] * 1000:.3f} ms)")
+            continue
+        if cell["status"] != "ok":
+            continue
+        ratio = float(np.median(np.divide(cell["map_times"], np.maximum(old["map_times"], 1e-9))))
+        if ratio > 1.0 + threshold and cell["time_median"] > min_time:
+            regressions.append(f"{key}: tiempo {old['time_median'] * 1000:.3f} -> "
+                               f"{cell['time_median'] * 1000:.3f} ms (x{ratio:.2f})")
+        if cell["expanded_median"] != old["expanded_median"]:
+            regressions.append(f"{key}: expandidos {old['expanded_median']:.0f} -> {cell['expanded_median']:.0f}")
+    return regressions
+
+
+def plot_scaling(results, out_dir):
+    """Curvas log-log de tiempo y expandidos contra estados, una figura por densidad."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for p in sorted({cell["p"] for cell in results}):
+        fig, (time_ax, expanded_ax) = plt.subplots(1, 2, figsize=(12, 5))
+        labels = list(dict.fromkeys(cell["algorithm"] for cell in results))
+        for label in labels:
+            cells = [cell for cell in results if cell["algorithm"] == label and cell["p"] == p and cell["status"] == "ok"]
+            if not cells:
+                continue
+            states = [cell["states"] for cell in cells]
+            time_ax.errorbar(states, [cell["time_median"] for cell in cells],
+                             yerr=[cell["time_iqr"] / 2 for cell in cells], marker="o", label=label)
+            expanded_ax.plot(states, [max(cell["expanded_median"], 1.0) for cell in cells], marker="o", label=label)
+        for ax, ylabel in ((time_ax, "tiempo (s, mediana)"), (expanded_ax, "expandidos (mediana)")):
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+            ax.set_xlabel("estados (size²)")
+            ax.set_ylabel(ylabel)
+            ax.grid(True, which="both", alpha=0.3)
+            ax.legend()
+        fig.suptitle(f"Escalado de las búsquedas (p={p})")
+        fig.tight_layout()
+        path = os.path.join(out_dir, f"escalado_p{p}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escalado de las búsquedas de tp3 por tamaño de mapa")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(SIZES), help="Tamaños de grilla")
+    parser.add_argument("--densidades", type=float, nargs="+", default=list(DENSITIES),
+                        help="Probabilidades de celda congelada")
+    parser.add_argument("--algoritmos", nargs="+", default=None,
+                        help="Etiquetas a correr (por defecto: " + ", ".join(label for label, *_rest in ALGORITMOS)
+                        + "; opcionales: " + ", ".join(label for label, *_rest in ALGORITMOS_OPCIONALES) + ")")
+    parser.add_argument("--mapas", type=int, default=3, help="Mapas fijos por (tamaño, densidad)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Corridas medidas por mapa")
+    parser.add_argument("--calentamiento", type=int, default=1, help="Corridas sin medir por mapa")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de los mapas")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Límite en segundos por corrida")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="JSON de referencia")
+    parser.add_argument("--guardar", action="store_true", help="Guardar esta corrida como nueva referencia")
+    parser.add_argument("--umbral", type=float, default=0.2, help="Aumento relativo de tiempo que cuenta como regresión")
+    parser.add_argument("--minimo-ms", type=float, default=1.0, help="No marcar regresiones por debajo de este tiempo")
+    parser.add_argument("--graficos", default=None, help="Directorio para las curvas log-log (requiere matplotlib)")
+    args = parser.parse_args()
+    if args.repeticiones < 1:
+        parser.error("--repeticiones debe ser al menos 1")
+    if args.mapas < 1:
+        parser.error("--mapas debe ser al menos 1")
+    if args.calentamiento < 0:
+        parser.error("--calentamiento no puede ser negativo")
+
+    algorithms = ALGORITMOS
+    if args.algoritmos:
+        available = ALGORITMOS + ALGORITMOS_OPCIONALES
+        unknown = set(args.algoritmos) - {label for label, *_rest in available}
+        if unknown:
+            raise ValueError(f"Algoritmos no reconocidos: {', '.join(sorted(unknown))}")
+        algorithms = [cell for cell in available if cell[0] in args.algoritmos]
+
+    results = run_suite(args.tamanos, args.densidades, algorithms, args.mapas, args.repeticiones,
+                        args.calentamiento, args.seed, args.timeout)
+    slopes = scaling_slopes(results)
+    for key, slope in slopes.items():
+        print(f"Escalado {key}: tiempo ~ n^{slope['time']:.2f}, expandidos ~ n^{slope['expanded']:.2f}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "maps": args.mapas,
+            "repeats": args.repeticiones,
+            "warmup": args.calentamiento,
+        },
+        "results": results,
+        "slopes": slopes,
+    }
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.guardar:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.umbral, args.minimo_ms / 1000.0)
+        if regressions:
+            print(f"Regresiones contra {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+        else:
+            print(f"Sin regresiones contra {args.baseline} (umbral {args.umbral:.0%})")
+    else:
+        with open(args.baseline, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Referencia guardada en {args.baseline}")
+
+    if args.graficos:
+        for path in plot_scaling(results, args.graficos):
+            print(f"Gráfico: {path}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from algoritmos import (
+    _COST_INF,
+    _BucketFrontier,
+    _env_model,
+    _normalize_start_goal,
+    _reverse_index,
+    _step_cost,
+)
+
+
+def map_key(env):
+    """
+    Hash del mapa (desc o, si no hay, la tabla compilada) para indexar cachés por mapa.
+
+    Se guarda en el entorno junto a la tabla compilada y se reutiliza mientras ésta no
+    cambie, así las consultas repetidas no vuelven a hashear todo el mapa.
+    """
+    model = _env_model(env)
+    if model is None:
+        return None
+    next_states, _terminal, n_rows, n_cols, description, _num_actions = model
+    unwrapped_env = getattr(env, 'unwrapped', env)
+    cached = getattr(unwrapped_env, '_map_key', None)
+    if cached is not None and cached[0] is next_states:
+        return cached[1]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{n_rows}x{n_cols}".encode())
+    if description is not None:
+        cells = np.ascontiguousarray(description)
+        digest.update(cells.dtype.str.encode())
+        digest.update(cells.tobytes())
+    else:
+        digest.update(next_states.tobytes())
+    key = digest.hexdigest()
+    try:
+        unwrapped_env._map_key = (next_states, key)
+    except AttributeError:
+        pass
+    return key
+
+
+def _forward_index(next_states):
+    """Tabla compilada en formato CSR (mismo formato que _reverse_index), sin auto-lazos."""
+    num_states, num_actions = next_states.shape
+    targets = next_states.ravel()
+    positions = np.flatnonzero((targets >= 0) & (targets != np.arange(targets.size) // num_actions))
+    offsets = np.zeros(num_states + 1, dtype=np.int64)
+    np.cumsum(np.bincount(positions // num_actions, minlength=num_states), out=offsets[1:])
+    return offsets, targets[positions].astype(np.int64), positions % num_actions
+
+
+def _dijkstra_csr(index, source, num_states, scenario):
+    """Dijkstra con cola de baldes sobre un índice CSR (offsets, vecinos, acciones)."""
+    offsets, neighbors, actions = (arr.tolist() for arr in index)
+    dist = [_COST_INF] * num_states
+    dist[source] = 0
+    heap = _BucketFrontier()
+    heap.push((0, source))
+
+    while heap:
+        cost, state = heap.pop()
+        if cost > dist[state]:
+            continue
+        for idx in range(offsets[state], offsets[state + 1]):
+            neighbor = neighbors[idx]
+            new_cost = cost + _step_cost(actions[idx], scenario)
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                heap.push((new_cost, neighbor))
+
+    return np.asarray(dist, dtype=np.int32)
+
+
+def reverse_dijkstra(next_states, goal_state, scenario=1):
+    """
+    Costo hasta goal_state desde cada estado (int32, _COST_INF si no la alcanza).
+
+    Dijkstra sobre el índice inverso de transiciones: cada arista p -> t por la acción a
+    cuesta _step_cost(a, scenario), como en la búsqueda hacia adelante.
+    """
+    return _dijkstra_csr(_reverse_index(next_states), goal_state, next_states.shape[0], scenario)
+
+
+def forward_dijkstra(next_states, source_state, scenario=1):
+    """Costo desde source_state hasta cada estado (int32, _COST_INF si no es alcanzable)."""
+    return _dijkstra_csr(_forward_index(next_states), source_state, next_states.shape[0], scenario)
+
+
+class DistanceFieldCache:
+    """
+    Campos de costo-a-la-meta por (mapa, meta, escenario) con desalojo LRU.
+
+    Cada campo se calcula una sola vez con reverse_dijkstra; después cualquier consulta
+    start -> goal sobre el mismo mapa se responde por descenso greedy en O(largo del camino),
+    y el campo sirve como heurística perfecta para algoritmos.astar.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._fields = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fields)
+
+    def _resolve(self, env, start, goal):
+        model = _env_model(env)
+        if model is None:
+            return None
+        next_states, _terminal, _n_rows, n_cols, description, _num_actions = model
+        start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+        return next_states, start_state, goal_state
+
+    def field(self, env, goal=None, scenario=1):
+        """Campo de distancias hacia goal (estado, (fila, col) o None para la G del mapa)."""
+        resolved = self._resolve(env, None, goal)
+        if resolved is None or resolved[2] is None:
+            return None
+        next_states, _start_state, goal_state = resolved
+        return self._field(env, next_states, goal_state, scenario)
+
+    def _field(self, env, next_states, goal_state, scenario):
+        key = (map_key(env), goal_state, scenario)
+        dist = self._fields.get(key)
+        if dist is not None:
+            self._fields.move_to_end(key)
+            self.hits += 1
+            return dist
+
+        self.misses += 1
+        dist = reverse_dijkstra(next_states, goal_state, scenario)
+        self._fields[key] = dist
+        self._bytes += dist.nbytes
+        while self._bytes > self.max_bytes and len(self._fields) > 1:
+            _old_key, old_dist = self._fields.popitem(last=False)
+            self._bytes -= old_dist.nbytes
+        return dist
+
+    def query(self, env, start=None, goal=None, scenario=1):
+        """
+        Camino óptimo start -> goal bajando por el campo: en cada estado se toma la acción
+        con costo + dist[siguiente] == dist[actual]. Devuelve (acciones, estados visitados).
+        """
+        resolved = self._resolve(env, start, goal)
+        if resolved is None or resolved[1] is None or resolved[2] is None:
+            return [], 0
+        next_states, start_state, goal_state = resolved
+        dist = self._field(env, next_states, goal_state, scenario)
+        if dist[start_state] == _COST_INF:
+            return [], 1
+
+        actions = []
+        state = start_state
+        while state != goal_state:
+            remaining = int(dist[state])
+            for action, next_state in enumerate(next_states[state].tolist()):
+                if next_state >= 0 and next_state != state and \
+                        int(dist[next_state]) + _step_cost(action, scenario) == remaining:
+                    actions.append(action)
+                    state = next_state
+                    break
+        return actions, len(actions) + 1
+
+    def heuristic(self, env, goal=None, scenario=1):
+        """Heurística perfecta (costo exacto a la meta) para pasar a astar(heuristic=...)."""
+        dist = self.field(env, goal, scenario)
+        if dist is None:
+            return None
+        values = dist.tolist()
+        return lambda state: values[state]
+
+
+class LandmarkTable:
+    """
+    Heurística ALT: distancias desde y hacia K landmarks elegidos por punto más lejano.
+
+    Por desigualdad triangular, para cada landmark L y meta t:
+        d(v, t) >= d(v, L) - d(t, L)    y    d(v, t) >= d(L, t) - d(L, v)
+    heuristic() toma el máximo de esas cotas (y de Manhattan), que sigue siendo admisible y
+    consistente con los costos asimétricos del escenario 2. Una cota con un término infinito
+    no se descarta: si la meta alcanza a L y v no, v no alcanza la meta y h(v) = _COST_INF
+    (como en DistanceFieldCache.heuristic); si v no es alcanzable desde L la cota vale 0.
+    """
+
+    def __init__(self, landmarks, forward, backward, scenario):
+        self.landmarks = np.asarray(landmarks, dtype=np.int64)
+        self.forward = forward    # forward[i, v] = d(L_i, v)
+        self.backward = backward  # backward[i, v] = d(v, L_i)
+        self.scenario = scenario
+
+    @classmethod
+    def build(cls, env, scenario=1, k=8):
+        """Elige k landmarks: el más lejano a S y luego el que maximiza la distancia mínima a los ya elegidos."""
+        model = _env_model(env)
+        next_states, _terminal, _n_rows, n_cols, description, _num_actions = model
+        start_state, _goal_state = _normalize_start_goal(env, None, None, description, n_cols)
+        num_states = next_states.shape[0]
+        forward_index = _forward_index(next_states)
+        reverse_index = _reverse_index(next_states)
+
+        seed_state = start_state if start_state is not None else 0
+        seed_dist = _dijkstra_csr(forward_index, seed_state, num_states, scenario).astype(np.int64)
+        reachable = seed_dist != _COST_INF
+        spread = np.where(reachable, seed_dist, -1)
+
+        landmarks, forward, backward = [], [], []
+        for _ in range(min(k, int(reachable.sum()))):
+            landmark = int(np.argmax(spread))
+            if spread[landmark] < 0:
+                break
+            landmarks.append(landmark)
+            forward.append(_dijkstra_csr(forward_index, landmark, num_states, scenario))
+            backward.append(_dijkstra_csr(reverse_index, landmark, num_states, scenario))
+            # Distancia mínima a los landmarks elegidos (en ambos sentidos)
+            to_landmark = np.minimum(forward[-1], backward[-1]).astype(np.int64)
+            if len(landmarks) > 1:
+                to_landmark = np.minimum(spread, to_landmark)
+            spread = np.where(reachable, to_landmark, -1)
+            spread[landmarks] = -1
+
+        shape = (len(landmarks), num_states)
+        return cls(landmarks,
+                   np.asarray(forward, dtype=np.int32).reshape(shape),
+                   np.asarray(backward, dtype=np.int32).reshape(shape),
+                   scenario)
+
+    @staticmethod
+    def path_for(cache_dir, env, scenario, k):
+        return os.path.join(cache_dir, f"{map_key(env)}.alt-e{scenario}-k{k}.npz")
+
+    @classmethod
+    def load_or_build(cls, env, scenario=1, k=8, cache_dir=None):
+        """Reutiliza la tabla guardada en cache_dir para este mapa o la construye y la guarda."""
+        if cache_dir is None:
+            return cls.build(env, scenario, k)
+        path = cls.path_for(cache_dir, env, scenario, k)
+        if os.path.exists(path):
+            return cls.load(path)
+        table = cls.build(env, scenario, k)
+        os.makedirs(cache_dir, exist_ok=True)
+        table.save(path)
+        return table
+
+    def save(self, path):
+        np.savez(path, landmarks=self.landmarks, forward=self.forward,
+                 backward=self.backward, scenario=self.scenario)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['landmarks'], data['forward'], data['backward'], int(data['scenario']))
+
+    def heuristic(self, env, goal=None):
+        """h(v) para la meta goal (o la G del mapa), lista para astar(heuristic=...)."""
+        model = _env_model(env)
+        next_states, _terminal, _n_rows, n_cols, description, _num_actions = model
+        _start_state, goal_state = _normalize_start_goal(env, None, goal, description, n_cols)
+
+        rows, cols = np.divmod(np.arange(next_states.shape[0]), n_cols)
+        goal_row, goal_col = divmod(goal_state, n_cols)
+        dx = np.abs(cols - goal_col)
+        dy = np.abs(rows - goal_row)
+        bound = dx + dy if self.scenario == 1 else dx * 1 + dy * 10
+
+        forward = self.forward.astype(np.int64)
+        backward = self.backward.astype(np.int64)
+        forward_goal = forward[:, [goal_state]]
+        backward_goal = backward[:, [goal_state]]
+        known_forward = (forward != _COST_INF) & (forward_goal != _COST_INF)
+        known_backward = (backward != _COST_INF) & (backward_goal != _COST_INF)
+        if len(self.landmarks):
+            bound = np.maximum(bound, np.where(known_backward, backward - backward_goal, 0).max(axis=0))
+            bound = np.maximum(bound, np.where(known_forward, forward_goal - forward, 0).max(axis=0))
+            # Si la meta llega a L y v no, v tampoco llega a la meta. Anular esa cota en
+            # lugar de marcar v como muerto rompe la consistencia en las aristas hacia v
+            dead = ((backward == _COST_INF) & (backward_goal != _COST_INF)).any(axis=0)
+            bound = np.where(dead, _COST_INF, bound)
+
+        values = bound.tolist()
+        return lambda state: values[state]
@@ -3,12 +3,58 @@ from gymnasium import wrappers
 import argparse
 import time
 import numpy as np
+import telemetria
 from randomCustom import generate_random_map_custom
-from algoritmos import bfs, dfs, dls, ucs, astar
+from grilla import GridEnv
+from distancias import LandmarkTable
+from jerarquico import hpa_star
+from mapcache import MapCache
+from planificacion import solve
+from simulacion import is_deterministic, random_walks, summarize_walks, validate_path
+from algoritmos import bfs, bfs_vectorized, bidirectional_bfs, dfs, dls, ucs, astar, ara_star, beam_search, bidirectional_astar, jps, ida_star, sma_star
 
 
-def _run_actions(env, actions, scenario, states_explored=None):
-    """Ejecuta una secuencia de acciones en el entorno y muestra métricas uniformes."""
+def make_env(description, render_mode=None, max_steps=1000, native=False, slippery=False, compiled=None):
+    """
+    FrozenLake sobre description (determinista salvo slippery=True), con el mismo TimeLimit
+    que usan los experimentos. Con native=True devuelve un GridEnv (sin construir P de
+    gymnasium; no dibuja y sólo es determinista). compiled=(next_states, terminal), p. ej.
+    de MapCache, evita recompilar la tabla de transiciones.
+    """
+    if native:
+        if render_mode is not None:
+            raise ValueError("El entorno nativo no soporta render; use --render none")
+        if slippery:
+            raise ValueError("El entorno nativo es determinista; no combine --nativo con --resbaladizo")
+        return GridEnv(description, max_steps=max_steps, compiled=compiled)
+
+    render_kwargs = {}
+    if render_mode is not None:
+        render_kwargs["render_mode"] = render_mode
+
+    env = gym.make(
+        'FrozenLake-v1',
+        desc=description,
+        is_slippery=slippery,
+        **render_kwargs
+    ).env
+    if compiled is not None and not slippery:
+        # Misma forma que guarda algoritmos._env_model
+        env.unwrapped._compiled_model = (env.unwrapped.P, *compiled)
+    return wrappers.TimeLimit(env, max_steps)
+
+
+def _episode_metrics(env, actions, scenario, states_explored=None):
+    """
+    Devuelve (states_n, actions_count, actions_cost, solution_found) de una secuencia de
+    acciones. Si el entorno es determinista la recorre sobre la tabla compilada
+    (validate_path); si no, la ejecuta paso a paso con env.step.
+    """
+    if is_deterministic(env):
+        _final_state, steps, _hole_index, success, cost_e1, cost_e2 = validate_path(env, actions)
+        states_n = states_explored if states_explored is not None else steps + 1
+        return states_n, steps, cost_e1 if scenario == 1 else cost_e2, success
+
     obs, _info = env.reset()
     states = [obs]
     done = False
@@ -32,9 +78,26 @@ def _run_actions(env, actions, scenario, states_explored=None):
 
     solution_found = bool(done and last_reward == 1.0)
     states_n = states_explored if states_explored is not None else len(states)
+    return states_n, actions_count, actions_cost, solution_found
+
+
+def _run_actions(env, actions, scenario, states_explored=None):
+    """Ejecuta una secuencia de acciones en el entorno y muestra métricas uniformes."""
+    states_n, actions_count, actions_cost, solution_found = _episode_metrics(env, actions, scenario, states_explored)
     print(f"{states_n}, {actions_count}, {actions_cost}, {solution_found}")
 
 
+def _render_actions(env, actions):
+    """Repite la secuencia con env.step sólo para dibujarla (las métricas no dependen de esto)."""
+    env.reset()
+    for action in actions:
+        _obs, _reward, done, truncated, _ = env.step(action)
+        if env.render_mode == "ansi":
+            print(env.render())
+        if done or truncated:
+            break
+
+
 def _run_random_episode(env, scenario):
     obs, _info = env.reset()
     done = False
@@ -59,46 +122,121 @@ def _run_random_episode(env, scenario):
     return states_n, actions_count, actions_cost, solution_found
 
 
+def _run_policy_episode(env, policy, scenario):
+    """Sigue policy[estado] desde el inicio hasta terminar; mismas métricas que _run_random_episode."""
+    obs, _info = env.reset()
+    done = False
+    truncated = False
+    actions_count = 0
+    actions_cost = 0
+    last_reward = 0.0
+    states_n = 1  # incluye estado inicial
+
+    while not (done or truncated):
+        action = int(policy[obs])
+        obs, reward, done, truncated, _ = env.step(action)
+        last_reward = reward
+        actions_count += 1
+        if scenario == 1:
+            actions_cost += 1
+        else:
+            actions_cost += 1 if action in (0, 2) else 10
+        states_n += 1
+
+    solution_found = bool(done and last_reward == 1.0)
+    return states_n, actions_count, actions_cost, solution_found
+
+
 def main():
     parser = argparse.ArgumentParser(description="Resolver FrozenLake mediante búsqueda")
-    parser.add_argument("--algoritmo", default="random", help="random, bfs, dfs, dls, ucs, astar")
+    parser.add_argument("--algoritmo", default="random", help="random, bfs, bfs_vec, bibfs, dfs, dls, ucs, astar, ara, beam, biastar, jps, idastar, smastar, hpa, vi, pi")
     parser.add_argument("--size", type=int, default=16, help="tamaño de la grilla")
     parser.add_argument("--p", type=float, default=0.92, help="probabilidad de camino congelado")
     parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--episodios", type=int, default=1, help="Con random y más de 1, simula todos los episodios en lote")
     parser.add_argument("--limite", type=int, default=1000, help="Máximo de pasos para DLS")
     parser.add_argument("--scenario", type=int, choices=[1, 2], default=1, help="Escenario de costo: 1=uniforme, 2=U/D caro")
+    parser.add_argument("--compacto", action="store_true", help="BFS/UCS/A* con arreglos compactos (mapas muy grandes)")
+    parser.add_argument("--memoria", type=int, default=100000, help="Máximo de nodos de SMA* / entradas de la tabla de IDA*")
+    parser.add_argument("--frontera", choices=["auto", "heap", "bucket"], default="auto", help="Cola de prioridad para UCS/A*")
+    parser.add_argument("--heuristica", choices=["manhattan", "alt"], default="manhattan", help="Heurística de A*")
+    parser.add_argument("--landmarks", type=int, default=8, help="Cantidad de landmarks para --heuristica alt")
+    parser.add_argument("--cache", default="cache", help="Directorio donde se guardan las tablas de landmarks y los mapas")
+    parser.add_argument("--cache-mapas", action="store_true",
+                        help="Leer el mapa y su tabla compilada de la caché en disco (requiere --seed)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Tiempo máximo (ms) de ARA*; sin él corre hasta el óptimo")
+    parser.add_argument("--peso", type=float, default=3.0, help="Peso inicial de la heurística en ARA*")
+    parser.add_argument("--ancho", type=int, default=1000, help="Ancho del haz (estados por capa) de beam")
+    parser.add_argument("--cluster", type=int, default=16, help="Tamaño de cluster para HPA*")
+    parser.add_argument("--resbaladizo", action="store_true", help="FrozenLake estocástico (is_slippery=True); usar con vi/pi")
+    parser.add_argument("--gamma", type=float, default=0.99, help="Descuento para vi/pi")
+    parser.add_argument("--barrido", choices=["gauss-seidel", "jacobi"], default="gauss-seidel", help="Barridos de vi/pi")
+    parser.add_argument("--nativo", action="store_true", help="Usar el entorno de grilla propio en lugar de gymnasium")
+    parser.add_argument("--telemetria", default=None, help="Agregar un registro JSON por corrida a este archivo (.jsonl)")
+    parser.add_argument("--traza-memoria", action="store_true", help="Con --telemetria, medir el pico de memoria con tracemalloc")
     parser.add_argument("--render", choices=["none", "human", "ansi"], default="none")
     args = parser.parse_args()
+    if args.cache_mapas and args.seed is None:
+        parser.error("--cache-mapas requiere --seed")
 
-    description = generate_random_map_custom(args.size, args.p, args.seed)
-
-    render_kwargs = {}
-    if args.render != "none":
-        render_kwargs["render_mode"] = args.render
-
-    env = gym.make(
-        'FrozenLake-v1',
-        desc=description,
-        is_slippery=False,
-        **render_kwargs
-    ).env
-    env = wrappers.TimeLimit(env, 1000)
+    compiled = None
+    if args.cache_mapas:
+        description, next_states, terminal = MapCache(args.cache).load_or_generate(args.size, args.p, args.seed)
+        compiled = (next_states, terminal)
+    else:
+        description = generate_random_map_custom(args.size, args.p, args.seed)
+    env = make_env(description, render_mode=None if args.render == "none" else args.render, native=args.nativo,
+                   slippery=args.resbaladizo, compiled=compiled)
 
     print("Numero de estados:", env.observation_space.n)
     print("Numero de acciones:", env.action_space.n)
 
     algoritmo = (args.algoritmo or "random").lower()
 
-    if algoritmo == "random":
+    telemetry = None
+    if args.telemetria and algoritmo not in ("random", "vi", "pi"):
+        telemetry = telemetria.start(trace_memory=args.traza_memoria)
+
+    if algoritmo == "random" and args.episodios > 1:
+        inicio = time.perf_counter()
+        walks = random_walks(env, num_walkers=args.episodios, seed=args.seed)
+        fin = time.perf_counter()
+        summary = summarize_walks(*walks)
+        cost = summary[f"cost_e{args.scenario}"]
+        print(f"Episodios: {summary['episodes']}, éxito: {summary['success_rate']:.4f}, "
+              f"agujero: {summary['hole_rate']:.4f}, cortados: {summary['truncated_rate']:.4f}")
+        if cost is not None:
+            print(f"Costo (exitosos): media {cost['mean']:.1f}, p50 {cost['p50']:.0f}, "
+                  f"p90 {cost['p90']:.0f}, p99 {cost['p99']:.0f}")
+        print(f"Tiempo de simulación: {fin - inicio:.6f} s")
+        return
+    elif algoritmo == "random":
         inicio = time.perf_counter()
         states_n, actions_count, actions_cost, solution_found = _run_random_episode(env, scenario=args.scenario)
         fin = time.perf_counter()
         print(f"{states_n}, {actions_count}, {actions_cost}, {solution_found}")
         print(f"Tiempo de búsqueda: {fin - inicio:.6f} s")
         return
+    elif algoritmo in ("vi", "pi"):
+        inicio = time.perf_counter()
+        policy, _values, iterations = solve(env, method=algoritmo, gamma=args.gamma, sweep=args.barrido)
+        fin = time.perf_counter()
+        print(f"Iteraciones: {iterations}")
+        states_n, actions_count, actions_cost, solution_found = _run_policy_episode(env, policy, scenario=args.scenario)
+        print(f"{states_n}, {actions_count}, {actions_cost}, {solution_found}")
+        print(f"Tiempo de planificación: {fin - inicio:.6f} s")
+        return
     elif algoritmo == "bfs":
         inicio = time.perf_counter()
-        actions, expanded = bfs(env, start=None, goal=None)
+        actions, expanded = bfs(env, start=None, goal=None, compact=args.compacto)
+        fin = time.perf_counter()
+    elif algoritmo == "bfs_vec":
+        inicio = time.perf_counter()
+        actions, expanded = bfs_vectorized(env, start=None, goal=None)
+        fin = time.perf_counter()
+    elif algoritmo == "bibfs":
+        inicio = time.perf_counter()
+        actions, expanded = bidirectional_bfs(env, start=None, goal=None)
         fin = time.perf_counter()
     elif algoritmo == "dfs":
         inicio = time.perf_counter()
@@ -110,18 +248,70 @@ def main():
         fin = time.perf_counter()
     elif algoritmo == "ucs":
         inicio = time.perf_counter()
-        actions, expanded = ucs(env, start=None, goal=None, scenario=args.scenario)
+        actions, expanded = ucs(env, start=None, goal=None, scenario=args.scenario, compact=args.compacto, frontier=args.frontera)
         fin = time.perf_counter()
     elif algoritmo == "astar":
+        landmarks = None
+        if args.heuristica == "alt":
+            # Preprocesamiento por mapa (se reutiliza desde --cache), fuera del tiempo de búsqueda
+            landmarks = LandmarkTable.load_or_build(env, scenario=args.scenario, k=args.landmarks, cache_dir=args.cache)
+        inicio = time.perf_counter()
+        heuristic = landmarks.heuristic(env) if landmarks is not None else None
+        actions, expanded = astar(env, start=None, goal=None, scenario=args.scenario, compact=args.compacto,
+                                  frontier=args.frontera, heuristic=heuristic)
+        fin = time.perf_counter()
+    elif algoritmo == "ara":
+        def report(_actions, cost, bound, elapsed):
+            print(f"Mejora: costo {cost}, a lo sumo {bound:.3f} veces el óptimo ({elapsed:.3f} s)")
+
+        inicio = time.perf_counter()
+        actions, expanded = ara_star(env, start=None, goal=None, scenario=args.scenario,
+                                     budget_ms=args.budget_ms, weight=args.peso, on_improvement=report)
+        fin = time.perf_counter()
+    elif algoritmo == "beam":
+        stats = {}
+        inicio = time.perf_counter()
+        actions, expanded = beam_search(env, start=None, goal=None, scenario=args.scenario, width=args.ancho,
+                                        stats=stats)
+        fin = time.perf_counter()
+        if stats["may_be_suboptimal"]:
+            print("Aviso: el haz se podó por debajo del costo encontrado; el camino puede no ser óptimo")
+        elif stats["may_be_incomplete"]:
+            print("Aviso: el haz se podó; puede existir un camino que no se encontró")
+    elif algoritmo == "biastar":
         inicio = time.perf_counter()
-        actions, expanded = astar(env, start=None, goal=None, scenario=args.scenario)
+        actions, expanded = bidirectional_astar(env, start=None, goal=None, scenario=args.scenario)
+        fin = time.perf_counter()
+    elif algoritmo == "jps":
+        inicio = time.perf_counter()
+        actions, expanded = jps(env, start=None, goal=None, frontier=args.frontera)
+        fin = time.perf_counter()
+    elif algoritmo == "idastar":
+        inicio = time.perf_counter()
+        actions, expanded = ida_star(env, start=None, goal=None, scenario=args.scenario, table_size=args.memoria)
+        fin = time.perf_counter()
+    elif algoritmo == "smastar":
+        inicio = time.perf_counter()
+        actions, expanded = sma_star(env, start=None, goal=None, scenario=args.scenario, max_nodes=args.memoria)
+        fin = time.perf_counter()
+    elif algoritmo == "hpa":
+        inicio = time.perf_counter()
+        actions, expanded = hpa_star(env, start=None, goal=None, scenario=args.scenario, cluster_size=args.cluster)
         fin = time.perf_counter()
     else:
-        raise ValueError("Algoritmo no reconocido. Use: random, bfs, dfs, dls, ucs, astar")
+        raise ValueError("Algoritmo no reconocido. Use: random, bfs, bfs_vec, bibfs, dfs, dls, ucs, astar, ara, beam, biastar, jps, idastar, smastar, hpa, vi, pi")
+
+    if telemetry is not None:
+        telemetria.stop(telemetry)
+        extra = {"size": args.size, "p": args.p, "seed": args.seed, "scenario": args.scenario}
+        with open(args.telemetria, "a") as out:
+            out.write(telemetria.to_json_line(telemetria.record(algoritmo, telemetry, actions, expanded, extra)) + "\n")
 
     print("Acciones: ")
     print(actions)
     _run_actions(env, actions, scenario=args.scenario, states_explored=expanded)
+    if args.render != "none":
+        _render_actions(env, actions)
     print(f"Tiempo de búsqueda: {fin - inicio:.6f} s")
 
 
@@ -0,0 +1,171 @@
+import argparse
+import csv
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+import algoritmos
+import telemetria
+from entorno import _episode_metrics, _run_random_episode, make_env
+from mapcache import MapCache
+from randomCustom import generate_random_map_custom
+
+CSV_COLUMNS = ["algorithm_name", "env_n", "states_n", "actions_count", "actions_cost", "time", "solution_found"]
+
+# Misma grilla que expe.sh: (etiqueta, función de algoritmos.py, escenario, kwargs)
+CELDAS = [
+    ("RANDOM", "random", 1, {}),
+    ("BFS", "bfs", 1, {}),
+    ("DFS", "dfs", 1, {}),
+    ("DLS(50)", "dls", 1, {"limit": 50}),
+    ("DLS(75)", "dls", 1, {"limit": 75}),
+    ("DLS(100)", "dls", 1, {"limit": 100}),
+    ("UCS[E1]", "ucs", 1, {"scenario": 1}),
+    ("A*[E1]", "astar", 1, {"scenario": 1}),
+    ("UCS[E2]", "ucs", 2, {"scenario": 2}),
+    ("A*[E2]", "astar", 2, {"scenario": 2}),
+]
+
+
+class CeldaTimeout(Exception):
+    pass
+
+
+@contextmanager
+def _time_limit(seconds):
+    """Corta la celda actual con SIGALRM sin afectar al resto del lote (sólo Unix)."""
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def _expired(_signum, _frame):
+        raise CeldaTimeout(f"timeout de {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _error_row(label, seed):
+    return [label, seed, -1, -1, -1, "-1.0", False]
+
+
+# Una MapCache por directorio y por proceso: así cada worker mide el directorio una sola vez
+_MAP_CACHES = {}
+
+
+def _map_cache(cache_dir):
+    cache = _MAP_CACHES.get(cache_dir)
+    if cache is None:
+        cache = _MAP_CACHES[cache_dir] = MapCache(cache_dir)
+    return cache
+
+
+def run_seed(seed, size, p, timeout, celdas=CELDAS, native=False, telemetry=False, map_cache=None):
+    """
+    Construye el mapa de seed una sola vez y corre todas las celdas sobre él.
+    Devuelve (filas, fallos, registros) con filas en el formato de resultados.csv y, con
+    telemetry, un registro de telemetria.py por celda de búsqueda. Con map_cache (un
+    directorio) el mapa y su tabla compilada se leen de MapCache. Con el entorno de
+    gymnasium eso sólo ahorra generar y compilar el mapa: FrozenLake arma su propio P en
+    el constructor y eso domina en mapas grandes; la ganancia completa es con native.
+    """
+    if map_cache is not None:
+        description, next_states, terminal = _map_cache(map_cache).load_or_generate(size, p, seed)
+        env = make_env(description, native=native, compiled=(next_states, terminal))
+    else:
+        env = make_env(generate_random_map_custom(size, p, seed), native=native)
+    rows = []
+    failures = []
+    records = []
+
+    for label, algoritmo, scenario, kwargs in celdas:
+        try:
+            with _time_limit(timeout):
+                if algoritmo == "random":
+                    inicio = time.perf_counter()
+                    metrics = _run_random_episode(env, scenario=scenario)
+                    fin = time.perf_counter()
+                else:
+                    search = getattr(algoritmos, algoritmo)
+                    inicio = time.perf_counter()
+                    if telemetry:
+                        actions, expanded, data = telemetria.run(label, search, env, start=None, goal=None,
+                                                                 extra={"seed": seed, "size": size}, **kwargs)
+                        records.append(data)
+                    else:
+                        actions, expanded = search(env, start=None, goal=None, **kwargs)
+                    fin = time.perf_counter()
+                    metrics = _episode_metrics(env, actions, scenario, states_explored=expanded)
+        except Exception as exc:  # la celda falla, el lote sigue
+            rows.append(_error_row(label, seed))
+            failures.append(f"[seed={seed}] {label}  -> {type(exc).__name__}: {exc}")
+            continue
+
+        states_n, actions_count, actions_cost, solution_found = metrics
+        rows.append([label, seed, states_n, actions_count, actions_cost, f"{fin - inicio:.6f}", solution_found])
+
+    return rows, failures, records
+
+
+def run_batch(seeds, size, p, timeout, out_csv, fallos_log, workers=None, celdas=CELDAS, native=False,
+              telemetry_log=None, map_cache=None):
+    """
+    Reparte las seeds en un ProcessPoolExecutor y escribe las filas en orden de seed.
+    Con telemetry_log también escribe ahí un registro JSON por celda de búsqueda.
+    """
+    with open(out_csv, "w", newline="") as out, open(fallos_log, "w") as log, \
+            (open(telemetry_log, "w") if telemetry_log else nullcontext()) as telemetry_out, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+        futures = [(seed, executor.submit(run_seed, seed, size, p, timeout, celdas, native,
+                                                telemetry_out is not None, map_cache))
+                   for seed in seeds]
+        for seed, future in futures:
+            try:
+                rows, failures, records = future.result()
+            except Exception as exc:  # p. ej. el worker murió: se registra la seed completa como fallida
+                rows = [_error_row(label, seed) for label, *_rest in celdas]
+                failures = [f"[seed={seed}] worker -> {type(exc).__name__}: {exc}"]
+                records = []
+            writer.writerows(rows)
+            out.flush()
+            for line in failures:
+                log.write(line + "\n")
+            if telemetry_out is not None:
+                for data in records:
+                    telemetry_out.write(telemetria.to_json_line(data) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Correr la grilla de experimentos de expe.sh en un solo proceso por worker")
+    parser.add_argument("--iter", type=int, default=30, help="Cantidad de seeds (1..iter)")
+    parser.add_argument("--size", type=int, default=16, help="tamaño de la grilla")
+    parser.add_argument("--p", type=float, default=0.92, help="probabilidad de camino congelado")
+    parser.add_argument("--timeout", type=float, default=15.0, help="Límite en segundos por celda (algoritmo, seed)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto, núcleos disponibles)")
+    parser.add_argument("--nativo", action="store_true", help="Usar el entorno de grilla propio en lugar de gymnasium")
+    parser.add_argument("--telemetria", default=None, help="Archivo .jsonl con un registro de telemetría por celda")
+    parser.add_argument("--cache-mapas", default=None, help="Directorio de MapCache para reutilizar los mapas entre corridas")
+    parser.add_argument("--salida", default="resultados.csv", help="CSV de salida")
+    parser.add_argument("--fallos", default="fallos.log", help="Log de celdas fallidas")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    run_batch(range(1, args.iter + 1), args.size, args.p, args.timeout, args.salida, args.fallos, args.workers,
+              native=args.nativo, telemetry_log=args.telemetria, map_cache=args.cache_mapas)
+    fin = time.perf_counter()
+
+    print(f"Listo. CSV: {args.salida} ({fin - inicio:.2f} s, {args.workers or os.cpu_count()} workers)")
+    print(f"Detalle de fallos (si los hubo): {args.fallos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from algoritmos import _compile_grid
+
+
+class _Discrete:
+    """Espacio discreto mínimo (n y sample) con la misma interfaz que usan los scripts."""
+
+    def __init__(self, n, np_random):
+        self.n = n
+        self._np_random = np_random
+
+    def sample(self):
+        return int(self._np_random.integers(self.n))
+
+
+class _TransitionView(Mapping):
+    """
+    Vista de sólo lectura con el formato de P de gymnasium: view[s][a] = [(1.0, s', r, done)].
+
+    Las entradas se arman al pedirlas desde la tabla compilada; nunca se materializa el
+    diccionario completo.
+    """
+
+    def __init__(self, next_states, terminal, goal_mask):
+        self._next_states = next_states
+        self._terminal = terminal
+        self._goal_mask = goal_mask
+
+    def __len__(self):
+        return self._next_states.shape[0]
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def __getitem__(self, state):
+        if not 0 <= state < len(self):
+            raise KeyError(state)
+        if self._terminal[state]:
+            return {action: [(1.0, state, 0, True)] for action in range(self._next_states.shape[1])}
+        actions_model = {}
+        for action, next_state in enumerate(self._next_states[state].tolist()):
+            reward = float(self._goal_mask[next_state])
+            actions_model[action] = [(1.0, next_state, reward, bool(self._terminal[next_state]))]
+        return actions_model
+
+
+class GridEnv:
+    """
+    FrozenLake determinista sin gymnasium, respaldado por la grilla de bytes del mapa.
+
+    Expone lo que leen algoritmos._env_model (nrow, ncol, desc, P, observation_space.n,
+    action_space.n) y deja la tabla compilada ya guardada en _compiled_model, así las
+    búsquedas nunca recorren P. reset/step siguen el contrato de gymnasium con el mismo
+    corte por max_steps que wrappers.TimeLimit.
+    """
+
+    def __init__(self, description, max_steps=1000, compiled=None):
+        cells = np.asarray(description)
+        if cells.ndim == 1:
+            cells = np.asarray([list(row) for row in cells], dtype='S1')
+        self.desc = cells.astype('S1')
+        self.nrow, self.ncol = self.desc.shape
+        self.max_steps = max_steps
+
+        next_states, terminal = compiled if compiled is not None else _compile_grid(self.desc)
+        goal_mask = (self.desc == b'G').reshape(-1)
+        self.P = _TransitionView(next_states, terminal, goal_mask)
+        self._compiled_model = (self.P, next_states, terminal)
+        self._goal_mask = goal_mask
+
+        starts = np.flatnonzero(self.desc.reshape(-1) == b'S')
+        self.initial_state = int(starts[0]) if starts.size else 0
+        self.np_random = np.random.default_rng()
+        self.observation_space = _Discrete(self.nrow * self.ncol, self.np_random)
+        self.action_space = _Discrete(next_states.shape[1], self.np_random)
+
+        self.s = self.initial_state
+        self.lastaction = None
+        self._elapsed_steps = 0
+
+    @property
+    def unwrapped(self):
+        return self
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+            self.observation_space._np_random = self.np_random
+            self.action_space._np_random = self.np_random
+        self.s = self.initial_state
+        self.lastaction = None
+        self._elapsed_steps = 0
+        return self.s, {"prob": 1}
+
+    def step(self, action):
+        _model, next_states, terminal = self._compiled_model
+        state = self.s
+        reward = 0.0
+        # Los estados terminales sólo tienen auto-lazos sin recompensa, como en FrozenLake
+        if not terminal[state]:
+            state = int(next_states[state, action])
+            reward = float(self._goal_mask[state])
+        self.s = state
+        self.lastaction = action
+        self._elapsed_steps += 1
+        truncated = self._elapsed_steps >= self.max_steps
+        return state, reward, bool(terminal[state]), truncated, {"prob": 1.0}
+
+    def close(self):
+        pass
@@ -0,0 +1,445 @@
+from collections import OrderedDict
+
+import numpy as np
+
+import algoritmos
+from algoritmos import _env_model, _make_frontier, _manhattan_heuristic, _normalize_start_goal, _step_cost
+from distancias import map_key
+
+# FrozenLake: 0 LEFT, 1 DOWN, 2 RIGHT, 3 UP
+_MOVES = ((0, -1), (1, 0), (0, 1), (-1, 0))
+_OPPOSITE = (2, 3, 0, 1)
+
+# Abstracciones ya construidas por (hash del mapa, tamaño de cluster, escenario), con desalojo LRU
+_ABSTRACTIONS = OrderedDict()
+_MAX_ABSTRACTIONS = 8
+
+
+class HierarchicalMap:
+    """
+    Abstracción HPA* de un mapa FrozenLake.
+
+    La grilla se divide en clusters de cluster_size x cluster_size. Sobre cada borde entre
+    clusters vecinos, cada tramo de celdas transitables a ambos lados aporta una transición
+    (en el medio si el tramo mide menos de 6, en los extremos si no). Las celdas de las
+    transiciones son los nodos abstractos; las aristas intra-cluster se precalculan con
+    Dijkstra restringido al cluster. Una consulta inserta S y G, corre A* sobre el grafo
+    abstracto, refina sólo los tramos elegidos y después suaviza el camino (ver query).
+    """
+
+    def __init__(self, env, cluster_size=16, scenario=1):
+        model = _env_model(env)
+        if model is None:
+            raise ValueError("El entorno no expone un modelo de transiciones")
+        _next_states, _terminal, n_rows, n_cols, description, _num_actions = model
+        self.env = env
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.cluster_size = cluster_size
+        self.scenario = scenario
+        # Copia propia: update() la edita sin tocar el mapa del entorno
+        self.description = np.array(description)
+
+        cells = self.description.reshape(-1)
+        hole, goal = (b'H', b'G') if cells.dtype.kind == 'S' else ('H', 'G')
+        self.walkable = (cells != hole).tolist()
+        self.exit_blocked = (cells == goal).tolist()  # la meta termina el episodio
+
+        self.n_cluster_rows = -(-n_rows // cluster_size)
+        self.n_cluster_cols = -(-n_cols // cluster_size)
+        self.borders = {}  # (cluster, cluster_vecino) -> [(celda, celda_vecina), ...]
+        self.intra = {}    # cluster -> {nodo: {nodo: costo}}
+        self.inter = {}    # nodo -> [(nodo, acción, costo)]
+
+        for cluster in self._clusters():
+            for neighbor in self._forward_neighbors(cluster):
+                self._build_border(cluster, neighbor)
+        self._build_inter()
+        for cluster in self._clusters():
+            self._build_intra(cluster)
+
+    @classmethod
+    def for_env(cls, env, cluster_size=16, scenario=1):
+        """
+        Abstracción cacheada del mapa de env (se construye una vez por mapa). Se guardan las
+        _MAX_ABSTRACTIONS usadas más recientemente.
+        """
+        key = (map_key(env), cluster_size, scenario)
+        abstraction = _ABSTRACTIONS.get(key)
+        if abstraction is not None:
+            _ABSTRACTIONS.move_to_end(key)
+            return abstraction
+        abstraction = cls(env, cluster_size, scenario)
+        _ABSTRACTIONS[key] = abstraction
+        while len(_ABSTRACTIONS) > _MAX_ABSTRACTIONS:
+            _ABSTRACTIONS.popitem(last=False)
+        return abstraction
+
+    # --- geometría -------------------------------------------------------------------
+
+    def _clusters(self):
+        for cluster_row in range(self.n_cluster_rows):
+            for cluster_col in range(self.n_cluster_cols):
+                yield (cluster_row, cluster_col)
+
+    def _forward_neighbors(self, cluster):
+        """Cluster de la derecha y de abajo (cada borde se construye una sola vez)."""
+        cluster_row, cluster_col = cluster
+        if cluster_col + 1 < self.n_cluster_cols:
+            yield (cluster_row, cluster_col + 1)
+        if cluster_row + 1 < self.n_cluster_rows:
+            yield (cluster_row + 1, cluster_col)
+
+    def _adjacent_clusters(self, cluster):
+        cluster_row, cluster_col = cluster
+        for d_row, d_col in _MOVES:
+            row, col = cluster_row + d_row, cluster_col + d_col
+            if 0 <= row < self.n_cluster_rows and 0 <= col < self.n_cluster_cols:
+                yield (row, col)
+
+    def _bounds(self, cluster):
+        cluster_row, cluster_col = cluster
+        size = self.cluster_size
+        return (cluster_row * size, min((cluster_row + 1) * size, self.n_rows),
+                cluster_col * size, min((cluster_col + 1) * size, self.n_cols))
+
+    def _merged_bounds(self, cluster, other):
+        """Rectángulo que cubre a los dos clusters."""
+        row0, row1, col0, col1 = self._bounds(cluster)
+        other_row0, other_row1, other_col0, other_col1 = self._bounds(other)
+        return min(row0, other_row0), max(row1, other_row1), min(col0, other_col0), max(col1, other_col1)
+
+    def _border_keys(self, state):
+        """Bordes (cluster, cluster_vecino) sobre los que está la celda state."""
+        row, col = divmod(state, self.n_cols)
+        cluster = self.cluster_of(state)
+        row0, row1, col0, col1 = self._bounds(cluster)
+        for (d_row, d_col), on_edge in zip(_MOVES, (col == col0, row == row1 - 1, col == col1 - 1, row == row0)):
+            neighbor = (cluster[0] + d_row, cluster[1] + d_col)
+            if on_edge and 0 <= neighbor[0] < self.n_cluster_rows and 0 <= neighbor[1] < self.n_cluster_cols:
+                yield tuple(sorted((cluster, neighbor)))
+
+    def cluster_of(self, state):
+        row, col = divmod(state, self.n_cols)
+        return (row // self.cluster_size, col // self.cluster_size)
+
+    def _edge_cost(self, state, action, next_state):
+        if not (self.walkable[state] and self.walkable[next_state]) or self.exit_blocked[state]:
+            return None
+        return _step_cost(action, self.scenario)
+
+    # --- construcción ----------------------------------------------------------------
+
+    def _build_border(self, cluster, neighbor):
+        row0, row1, col0, col1 = self._bounds(cluster)
+        if neighbor[1] > cluster[1]:
+            pairs = [(row * self.n_cols + col1 - 1, row * self.n_cols + col1) for row in range(row0, row1)]
+        else:
+            pairs = [(row1 * self.n_cols + col - self.n_cols, row1 * self.n_cols + col) for col in range(col0, col1)]
+
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and self.walkable[pair[0]] and self.walkable[pair[1]]:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) < 6:
+                    transitions.append(run[len(run) // 2])
+                else:
+                    transitions.extend([run[0], run[-1]])
+            run = []
+        self.borders[(cluster, neighbor)] = transitions
+
+    def _build_inter(self):
+        self.inter = {}
+        for key in self.borders:
+            self._link_border(key)
+
+    def _link_border(self, key):
+        """Agrega a inter las aristas de las transiciones del borde key."""
+        cluster, neighbor = key
+        action, back = (2, 0) if neighbor[1] > cluster[1] else (1, 3)
+        for state, other in self.borders[key]:
+            for source, target, move in ((state, other, action), (other, state, back)):
+                cost = self._edge_cost(source, move, target)
+                if cost is not None:
+                    self.inter.setdefault(source, []).append((target, move, cost))
+
+    def _unlink_border(self, key):
+        """Quita de inter las aristas de las transiciones del borde key."""
+        for state, other in self.borders.get(key, []):
+            for source, target in ((state, other), (other, state)):
+                edges = [edge for edge in self.inter.get(source, []) if edge[0] != target]
+                if edges:
+                    self.inter[source] = edges
+                else:
+                    self.inter.pop(source, None)
+
+    def cluster_nodes(self, cluster):
+        nodes = set()
+        for neighbor in self._adjacent_clusters(cluster):
+            key = (cluster, neighbor) if (cluster, neighbor) in self.borders else (neighbor, cluster)
+            for state, other in self.borders.get(key, []):
+                nodes.add(state if self.cluster_of(state) == cluster else other)
+        return nodes
+
+    def _build_intra(self, cluster):
+        nodes = self.cluster_nodes(cluster)
+        edges = {}
+        for node in nodes:
+            dist, _parent = self._cluster_search(node)
+            edges[node] = {other: dist[other] for other in nodes if other != node and other in dist}
+        self.intra[cluster] = edges
+
+    def _cluster_search(self, source, reverse=False, bounds=None, target=None, clusters=None, telemetry=None):
+        """
+        Dijkstra restringido al cluster de source (o al rectángulo bounds = (fila0, fila1,
+        col0, col1)). Devuelve (dist, parent) con parent[s] = (estado_previo, acción). Con
+        reverse=True las distancias son hacia source. Con target es un A* (Manhattan del
+        escenario) que corta al asentarlo: sólo dist[target] es seguro que sea el mínimo.
+        Con telemetry cuenta cada estado alcanzado como expandido, igual que query (que
+        suma len(dist)); la construcción de la abstracción no lo pasa.
+        """
+        row0, row1, col0, col1 = bounds if bounds is not None else self._bounds(self.cluster_of(source))
+        if target is None:
+            def heuristic(_state):
+                return 0
+        else:
+            heuristic = _manhattan_heuristic(target, self.n_cols, self.scenario)
+        dist = {source: 0}
+        parent = {source: None}
+        heap = _make_frontier('auto', self.scenario)
+        heap.push((heuristic(source), 0, source))
+        if telemetry is not None:
+            telemetry.expand(len(heap), len(dist))
+        while heap:
+            _priority, cost, state = heap.pop()
+            if cost > dist[state]:
+                if telemetry is not None:
+                    telemetry.stale_pops += 1
+                continue
+            if state == target:
+                break
+            row, col = divmod(state, self.n_cols)
+            for action, (d_row, d_col) in enumerate(_MOVES):
+                n_row, n_col = row + d_row, col + d_col
+                if not (row0 <= n_row < row1 and col0 <= n_col < col1):
+                    continue
+                if clusters is not None and (n_row // self.cluster_size, n_col // self.cluster_size) not in clusters:
+                    continue
+                neighbor = n_row * self.n_cols + n_col
+                if reverse:
+                    step = self._edge_cost(neighbor, _OPPOSITE[action], state)
+                else:
+                    step = self._edge_cost(state, action, neighbor)
+                if step is None:
+                    continue
+                new_cost = cost + step
+                if new_cost < dist.get(neighbor, float('inf')):
+                    if telemetry is not None:
+                        telemetry.generated += 1
+                        if neighbor not in dist:
+                            telemetry.expand(len(heap) + 1, len(dist) + 1)
+                    dist[neighbor] = new_cost
+                    parent[neighbor] = (state, _OPPOSITE[action] if reverse else action)
+                    heap.push((new_cost + heuristic(neighbor), new_cost, neighbor))
+                elif telemetry is not None:
+                    telemetry.duplicates += 1
+        return dist, parent
+
+    def update(self, edits):
+        """
+        Aplica ediciones {(fila, col): 'H' | 'F'} y reconstruye sólo lo afectado: los bordes
+        sobre los que está alguna celda editada (y sus aristas inter) y las aristas intra
+        de los clusters editados y de los que comparten esos bordes. Devuelve esos clusters.
+
+        La abstracción editada deja de corresponder al mapa cacheado, así que se saca de la
+        caché de for_env: las consultas siguientes sobre el mapa original no la usan.
+        """
+        for key, abstraction in list(_ABSTRACTIONS.items()):
+            if abstraction is self:
+                del _ABSTRACTIONS[key]
+
+        rebuild = set()
+        borders = set()
+        for (row, col), cell in dict(edits).items():
+            if cell not in ('H', 'F'):
+                raise ValueError(f"Celda no reconocida: {cell}. Use: H, F")
+            current = self.description[row, col]
+            if current in (b'S', b'G', 'S', 'G'):
+                raise ValueError("No se puede editar la celda de inicio ni la meta")
+            state = row * self.n_cols + col
+            walkable = cell != 'H'
+            if self.walkable[state] == walkable:
+                continue
+            self.description[row, col] = cell
+            self.walkable[state] = walkable
+            self.exit_blocked[state] = False  # ni S ni G: sólo la meta bloquea la salida
+            rebuild.add(self.cluster_of(state))
+            borders.update(self._border_keys(state))
+
+        for key in borders:
+            self._unlink_border(key)
+            self._build_border(*key)
+            self._link_border(key)
+            rebuild.update(key)
+        for cluster in rebuild:
+            self._build_intra(cluster)
+        return rebuild
+
+    # --- consultas -------------------------------------------------------------------
+
+    def _refine(self, source, target, bounds=None, telemetry=None):
+        """Acciones desde source hasta target dentro del cluster de source (o de bounds)."""
+        _dist, parent = self._cluster_search(source, bounds=bounds, target=target, telemetry=telemetry)
+        return self._actions_to(parent, target), len(parent)
+
+    @staticmethod
+    def _actions_to(parent, target):
+        actions = []
+        state = target
+        while parent[state] is not None:
+            state, action = parent[state]
+            actions.append(action)
+        actions.reverse()
+        return actions
+
+    def _direct_bounds(self, start_cluster, goal_cluster):
+        """Rectángulo de los clusters de S y G si son el mismo o vecinos (también en diagonal)."""
+        if abs(start_cluster[0] - goal_cluster[0]) > 1 or abs(start_cluster[1] - goal_cluster[1]) > 1:
+            return None
+        return self._merged_bounds(start_cluster, goal_cluster)
+
+    def _smooth(self, start_state, goal_state, actions, telemetry=None):
+        """
+        A* de start_state a goal_state restringido al corredor de clusters que cruza el
+        camino refinado, más sus vecinos (también en diagonal). El corredor contiene al
+        camino, así que el resultado nunca es peor. Devuelve (acciones, estados alcanzados).
+        """
+        corridor = set()
+        state = start_state
+        for action in [None] + actions:
+            if action is not None:
+                d_row, d_col = _MOVES[action]
+                state += d_row * self.n_cols + d_col
+            cluster_row, cluster_col = self.cluster_of(state)
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    corridor.add((cluster_row + d_row, cluster_col + d_col))
+
+        dist, parent = self._cluster_search(start_state, bounds=(0, self.n_rows, 0, self.n_cols),
+                                            target=goal_state, clusters=corridor, telemetry=telemetry)
+        current = sum(_step_cost(action, self.scenario) for action in actions)
+        if dist.get(goal_state, current) < current:
+            actions = self._actions_to(parent, goal_state)
+        return actions, len(dist)
+
+    def query(self, start=None, goal=None):
+        """
+        Camino start -> goal por el grafo abstracto. Devuelve (acciones, expansiones).
+
+        Si S y G están en el mismo cluster o en clusters vecinos (también en diagonal) se
+        agrega una arista directa S -> G con el costo óptimo dentro del rectángulo de ambos.
+        El camino refinado se suaviza con _smooth.
+
+        Es subóptimo: el costo queda entre el óptimo y el del camino abstracto refinado, y
+        es el óptimo entre los caminos que no salen del corredor de _smooth. No hay una
+        cota multiplicativa general; sólo la acota la abstracción (el camino abstracto
+        atraviesa los clusters por sus puntos de entrada, y si el único camino óptimo pasa
+        por clusters que ese camino no cruza ni tiene de vecinos, queda afuera del
+        corredor). Con clusters chicos el corredor es angosto y el exceso puede ser grande.
+        """
+        start_state, goal_state = _normalize_start_goal(self.env, start, goal, self.description, self.n_cols)
+        if start_state is None or goal_state is None:
+            return [], 0
+
+        # Fases de telemetría: setup (abstracción e inserción de S y G), search (A* abstracto)
+        # y reconstruct (refinamiento y suavizado, lo cierra telemetria.stop)
+        telemetry = algoritmos._TELEMETRY
+        start_cluster = self.cluster_of(start_state)
+        goal_cluster = self.cluster_of(goal_state)
+        start_dist, _parent = self._cluster_search(start_state, telemetry=telemetry)
+        goal_dist, _parent = self._cluster_search(goal_state, reverse=True, telemetry=telemetry)
+        expanded = len(start_dist) + len(goal_dist)
+
+        start_edges = {node: start_dist[node] for node in self.cluster_nodes(start_cluster) if node in start_dist}
+        direct_bounds = self._direct_bounds(start_cluster, goal_cluster)
+        if direct_bounds is not None:
+            direct_dist, _parent = self._cluster_search(start_state, bounds=direct_bounds, target=goal_state,
+                                                        telemetry=telemetry)
+            expanded += len(direct_dist)
+            if goal_state in direct_dist:
+                start_edges[goal_state] = direct_dist[goal_state]
+        goal_edges = {node: goal_dist[node] for node in self.cluster_nodes(goal_cluster) if node in goal_dist}
+
+        heuristic = _manhattan_heuristic(goal_state, self.n_cols, self.scenario)
+        heap = _make_frontier('auto', self.scenario)
+        heap.push((heuristic(start_state), 0, start_state))
+        best_cost = {start_state: 0}
+        parent = {start_state: None}
+        if telemetry is not None:
+            telemetry.mark('setup')
+
+        found_goal = False
+        while heap:
+            _f_cost, g_cost, node = heap.pop()
+            if g_cost > best_cost[node]:
+                if telemetry is not None:
+                    telemetry.stale_pops += 1
+                continue
+            expanded += 1
+            if telemetry is not None:
+                telemetry.expand(len(heap), len(best_cost))
+            if node == goal_state:
+                found_goal = True
+                break
+
+            successors = list(self.intra[self.cluster_of(node)].get(node, {}).items())
+            successors.extend((other, cost) for other, _action, cost in self.inter.get(node, []))
+            if node == start_state:
+                successors.extend(start_edges.items())
+            if node in goal_edges:
+                successors.append((goal_state, goal_edges[node]))
+            for other, cost in successors:
+                new_cost = g_cost + cost
+                if new_cost < best_cost.get(other, float('inf')):
+                    best_cost[other] = new_cost
+                    parent[other] = node
+                    heap.push((new_cost + heuristic(other), new_cost, other))
+                    if telemetry is not None:
+                        telemetry.generated += 1
+                elif telemetry is not None:
+                    telemetry.duplicates += 1
+
+        if telemetry is not None:
+            telemetry.mark('search')
+        if not found_goal:
+            return [], expanded
+
+        abstract_path = [goal_state]
+        while parent[abstract_path[-1]] is not None:
+            abstract_path.append(parent[abstract_path[-1]])
+        abstract_path.reverse()
+
+        actions = []
+        for node, other in zip(abstract_path, abstract_path[1:]):
+            if node == start_state and other == goal_state and direct_bounds is not None:
+                segment, settled = self._refine(node, other, direct_bounds, telemetry)
+            elif self.cluster_of(node) != self.cluster_of(other):
+                segment = [next(action for target, action, _cost in self.inter[node] if target == other)]
+                settled = 0
+            else:
+                segment, settled = self._refine(node, other, telemetry=telemetry)
+            actions.extend(segment)
+            expanded += settled
+
+        actions, settled = self._smooth(start_state, goal_state, actions, telemetry)
+        return actions, expanded + settled
+
+
+def hpa_star(env, start, goal, scenario=1, cluster_size=16):
+    """HPA* con la abstracción cacheada del mapa; mismo contrato (acciones, expandidos) que astar()."""
+    if _env_model(env) is None:
+        return [], 0
+    return HierarchicalMap.for_env(env, cluster_size, scenario).query(start, goal)
@@ -0,0 +1,228 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algoritmos import _compile_grid
+from distancias import reverse_dijkstra
+from randomCustom import generate_random_map_custom
+
+# Cambiar si cambia generate_random_map_custom o el formato de las entradas
+GENERATOR_VERSION = 1
+
+_ARRAYS = ("desc", "next_states", "terminal", "goal")
+
+
+class MapCache:
+    """
+    Caché en disco de mapas generados y sus tablas compiladas, indexada por los parámetros
+    del generador (size, p, seed) de generate_random_map_custom.
+
+    Cada entrada es un directorio <cache_dir>/mapas/<clave>/ con un .npy crudo por arreglo:
+    desc (S1), next_states (int32), terminal y goal (bool; los agujeros son terminal & ~goal)
+    y, a pedido, dist-e<escenario> con el costo a la meta. Se abren con mmap_mode='r', así
+    varios workers que usan el mismo mapa comparten las páginas en lugar de copiarlo (por
+    eso .npy y no .npz, que no se puede mapear).
+
+    Las entradas se escriben en un directorio temporal y se publican con un rename atómico,
+    de modo que procesos en paralelo nunca ven una entrada a medias. El mtime del directorio
+    marca el último uso: si el total pasa max_bytes se borran las entradas menos usadas.
+    Recorrer el directorio cuesta O(entradas), así que cada instancia lo mide una vez, suma
+    lo que ella misma escribe y sólo vuelve a recorrerlo cuando esa estimación pasa
+    max_bytes (lo que escriben otros procesos se ve recién en ese barrido).
+    """
+
+    def __init__(self, cache_dir="cache", max_bytes=1 << 30):
+        self.root = os.path.join(cache_dir, "mapas")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._usage = None  # bytes estimados en disco (None = todavía sin medir)
+
+    @staticmethod
+    def key(size, p, seed):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"custom|v{GENERATOR_VERSION}|{size}|{float(p)!r}|{seed}".encode())
+        return digest.hexdigest()
+
+    def path_for(self, size, p, seed):
+        return os.path.join(self.root, self.key(size, p, seed))
+
+    def load_or_generate(self, size, p, seed):
+        """
+        (desc, next_states, terminal) del mapa generate_random_map_custom(size, p, seed),
+        mapeados desde disco; si la entrada no existe la genera, compila y guarda. Si otro
+        proceso la desaloja antes de abrirla, devuelve los arreglos generados en memoria.
+        """
+        if seed is None:
+            raise ValueError("Sólo se pueden cachear mapas con seed")
+        path = self.path_for(size, p, seed)
+        try:
+            arrays = self._open(path)
+            self.hits += 1
+        except FileNotFoundError:  # no está (o la desalojó otro proceso)
+            self.misses += 1
+            arrays = self._store(path, size, p, seed)
+            try:
+                arrays = self._open(path)
+            except FileNotFoundError:
+                # Otro proceso la desalojó entre el store y el open: sirven los arreglos recién generados
+                pass
+        self._touch(path)
+        desc, next_states, terminal, _goal = arrays
+        return desc, next_states, terminal
+
+    def distance_field(self, size, p, seed, scenario=1):
+        """
+        Costo desde cada estado hasta la G del mapa (reverse_dijkstra), guardado junto al mapa.
+        Si otro proceso desaloja la entrada mientras tanto, se devuelve el campo calculado.
+        """
+        desc, next_states, _terminal = self.load_or_generate(size, p, seed)
+        path = os.path.join(self.path_for(size, p, seed), f"dist-e{scenario}.npy")
+        try:
+            return np.load(path, mmap_mode='r')
+        except FileNotFoundError:
+            pass
+        goal_state = int(np.flatnonzero(np.asarray(desc).reshape(-1) == b'G')[0])
+        dist = reverse_dijkstra(next_states, goal_state, scenario)
+        try:
+            self._save_atomic(path, dist)
+        except FileNotFoundError:  # la entrada ya no existe
+            return dist
+        self._account(dist.nbytes)
+        return dist
+
+    def _store(self, path, size, p, seed):
+        cells = np.asarray([list(row) for row in generate_random_map_custom(size, p, seed)], dtype='S1')
+        next_states, terminal = _compile_grid(cells)
+        arrays = {"desc": cells, "next_states": next_states, "terminal": terminal,
+                  "goal": (cells == b'G').reshape(-1)}
+
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+        written = 0
+        try:
+            for name in _ARRAYS:
+                np.save(os.path.join(staging, f"{name}.npy"), arrays[name])
+            with open(os.path.join(staging, "meta.json"), "w") as out:
+                json.dump({"size": size, "p": p, "seed": seed, "version": GENERATOR_VERSION}, out)
+            written = sum(entry.stat().st_size for entry in os.scandir(staging))
+            os.rename(staging, path)
+        except OSError:
+            # Otro proceso publicó la misma entrada primero: se usa la suya
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+            written = 0
+        self._account(written)
+        return tuple(arrays[name] for name in _ARRAYS)
+
+    def _account(self, written):
+        """Suma written bytes a la estimación y desaloja si pasó max_bytes."""
+        if self._usage is None:
+            self._usage = self.evict()
+            return
+        self._usage += written
+        if self._usage > self.max_bytes:
+            # Se baja al 90%: así no hace falta recorrer el directorio en cada escritura
+            self._usage = self.evict(int(self.max_bytes * 0.9))
+
+    @staticmethod
+    def _save_atomic(path, array):
+        handle, staging = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(path))
+        with os.fdopen(handle, "wb") as out:
+            np.save(out, array)
+        os.replace(staging, path)
+
+    @staticmethod
+    def _open(path):
+        return tuple(np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in _ARRAYS)
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def entries(self):
+        """[(último uso, bytes, directorio)] de las entradas publicadas."""
+        if not os.path.isdir(self.root):
+            return []
+        result = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                used = os.stat(path).st_mtime
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+            except FileNotFoundError:  # la borró otro proceso
+                continue
+            result.append((used, size, path))
+        return result
+
+    def evict(self, limit=None):
+        """
+        Borra las entradas usadas hace más tiempo hasta quedar bajo limit (por defecto
+        max_bytes; deja al menos una). Devuelve el total que queda.
+        """
+        limit = self.max_bytes if limit is None else limit
+        entries = sorted(self.entries())
+        total = sum(size for _used, size, _path in entries)
+        while total > limit and len(entries) > 1:
+            _used, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+        return total
+
+
+def _prewarm_seed(cache_dir, max_bytes, size, p, seed, scenarios):
+    cache = MapCache(cache_dir, max_bytes)
+    inicio = time.perf_counter()
+    cache.load_or_generate(size, p, seed)
+    for scenario in scenarios:
+        cache.distance_field(size, p, seed, scenario)
+    return seed, cache.misses > 0, time.perf_counter() - inicio
+
+
+def prewarm(cache_dir, size, p, seeds, scenarios=(), max_bytes=1 << 30, workers=None):
+    """Genera en paralelo las entradas (y campos de distancia) de seeds que falten."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_prewarm_seed, cache_dir, max_bytes, size, p, seed, tuple(scenarios))
+                   for seed in seeds]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precalentar la caché de mapas para un lote de seeds")
+    parser.add_argument("--size", type=int, default=16, help="tamaño de la grilla")
+    parser.add_argument("--p", type=float, default=0.92, help="probabilidad de camino congelado")
+    parser.add_argument("--iter", type=int, default=30, help="Cantidad de seeds (1..iter)")
+    parser.add_argument("--distancias", type=int, nargs="*", choices=[1, 2], default=[],
+                        help="Escenarios cuyos campos de distancia a la meta también se guardan")
+    parser.add_argument("--cache", default="cache", help="Directorio de la caché")
+    parser.add_argument("--max-mb", type=float, default=1024, help="Tamaño máximo de la caché en disco (MB)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto, núcleos disponibles)")
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_mb * 1024 * 1024)
+    inicio = time.perf_counter()
+    results = prewarm(args.cache, args.size, args.p, range(1, args.iter + 1), args.distancias,
+                      max_bytes, args.workers)
+    fin = time.perf_counter()
+
+    generated = sum(1 for _seed, created, _elapsed in results if created)
+    total = MapCache(args.cache, max_bytes).evict()
+    print(f"Listo: {generated} mapas nuevos, {len(results) - generated} ya estaban "
+          f"({fin - inicio:.2f} s). Caché: {total / (1024 * 1024):.1f} MB en {args.cache}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import numpy as np
+
+from algoritmos import _env_model
+
+# FrozenLake: 0 LEFT, 1 DOWN, 2 RIGHT, 3 UP
+_MOVES = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+class SparseMDP:
+    """
+    Modelo estocástico completo de FrozenLake como matriz de transiciones en formato CSR.
+
+    La fila s * num_actions + a tiene sus transiciones en offsets[fila]:offsets[fila + 1],
+    con arreglos paralelos targets (estado siguiente), probs, rewards y continues (0.0 si
+    la transición termina el episodio). Así un backup de Bellman sobre todos los estados es
+    un gather de values[targets] y una suma por fila, sin recorrer P en Python.
+    """
+
+    def __init__(self, offsets, targets, probs, rewards, continues, num_states, num_actions, n_cols=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.probs = probs
+        self.rewards = rewards
+        self.continues = continues
+        self.num_states = num_states
+        self.num_actions = num_actions
+        self.n_cols = n_cols
+        self._reverse = None
+
+    @classmethod
+    def from_env(cls, env):
+        """Compila P (gymnasium, con o sin is_slippery) una sola vez."""
+        unwrapped_env = getattr(env, 'unwrapped', env)
+        transitions_model = unwrapped_env.P
+        num_states = env.observation_space.n
+        num_actions = env.action_space.n
+
+        lengths = np.zeros(num_states * num_actions, dtype=np.int64)
+        targets, probs, rewards, continues = [], [], [], []
+        for state in range(num_states):
+            actions_model = transitions_model.get(state, {})
+            for action in range(num_actions):
+                transitions = actions_model.get(action, [])
+                lengths[state * num_actions + action] = len(transitions)
+                for prob, next_state, reward, done in transitions:
+                    targets.append(next_state)
+                    probs.append(prob)
+                    rewards.append(reward)
+                    continues.append(0.0 if done else 1.0)
+
+        offsets = np.zeros(lengths.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(offsets, np.asarray(targets, dtype=np.int64), np.asarray(probs, dtype=np.float64),
+                   np.asarray(rewards, dtype=np.float64), np.asarray(continues, dtype=np.float64),
+                   num_states, num_actions, getattr(unwrapped_env, 'ncol', None))
+
+    @classmethod
+    def from_grid(cls, description, slippery=True, success_rate=1.0 / 3.0):
+        """
+        Mismo modelo que FrozenLake-v1(desc, is_slippery, success_rate) armado directamente
+        desde la grilla: con slippery, la acción a va a a con success_rate y a cada
+        perpendicular con la mitad del resto. Sirve para mapas donde construir P no es viable.
+        """
+        cells = np.asarray(description)
+        if cells.ndim == 1:
+            cells = np.asarray([list(row) for row in cells], dtype='S1')
+        cells = cells.astype('S1')
+        n_rows, n_cols = cells.shape
+        num_states = n_rows * n_cols
+        num_actions = len(_MOVES)
+        flat = cells.reshape(-1)
+        terminal = (flat == b'H') | (flat == b'G')
+        states = np.arange(num_states)
+        rows, cols = np.divmod(states, n_cols)
+
+        def move(direction):
+            d_row, d_col = _MOVES[direction]
+            return (np.clip(rows + d_row, 0, n_rows - 1) * n_cols + np.clip(cols + d_col, 0, n_cols - 1))
+
+        if slippery:
+            fail_rate = (1.0 - success_rate) / 2.0
+            branches = [((action - 1) % 4, action, (action + 1) % 4) for action in range(num_actions)]
+            weights = np.array([fail_rate, success_rate, fail_rate])
+        else:
+            branches = [(action,) for action in range(num_actions)]
+            weights = np.array([1.0])
+        width = len(weights)
+
+        targets = np.stack([np.stack([move(direction) for direction in branch], axis=1)
+                            for branch in branches], axis=1)                       # [S, A, width]
+        probs = np.broadcast_to(weights, targets.shape).copy()
+        # Los estados terminales sólo tienen un auto-lazo seguro y sin recompensa
+        targets[terminal] = states[terminal, None, None]
+        probs[terminal] = np.where(np.arange(width) == 0, 1.0, 0.0)
+        rewards = (flat[targets] == b'G').astype(np.float64)
+        continues = (~terminal[targets]).astype(np.float64)
+        rewards[terminal] = 0.0
+        continues[terminal] = 0.0
+
+        offsets = np.arange(0, num_states * num_actions * width + 1, width, dtype=np.int64)
+        return cls(offsets, targets.reshape(-1), probs.reshape(-1), rewards.reshape(-1),
+                   continues.reshape(-1), num_states, num_actions, n_cols)
+
+    # --- backups ---------------------------------------------------------------------
+
+    def _rows(self, states, actions=None):
+        """Submodelo (offsets, targets, probs, rewards, continues) con las filas de esos estados."""
+        if actions is None:
+            rows = (states[:, None] * self.num_actions + np.arange(self.num_actions)).reshape(-1)
+        else:
+            rows = states * self.num_actions + actions
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        offsets = np.zeros(rows.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return (offsets, self.targets[positions], self.probs[positions],
+                self.rewards[positions], self.continues[positions])
+
+    @staticmethod
+    def _backup(rows, values, gamma):
+        """Valor esperado r + gamma * V(s') de cada fila del submodelo."""
+        offsets, targets, probs, rewards, continues = rows
+        expected = probs * (rewards + gamma * continues * values[targets])
+        width = offsets[1] - offsets[0]
+        if offsets[-1] == width * (offsets.size - 1):
+            return expected.reshape(-1, width).sum(axis=1)  # todas las filas del mismo largo
+        return np.add.reduceat(expected, offsets[:-1])
+
+    def _predecessors(self, states):
+        """Estados con alguna transición hacia states (con repeticiones), vía índice inverso CSR."""
+        if self._reverse is None:
+            lengths = np.diff(self.offsets)
+            sources = np.repeat(np.arange(lengths.size) // self.num_actions, lengths)
+            order = np.argsort(self.targets, kind='stable')
+            offsets = np.zeros(self.num_states + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=self.num_states), out=offsets[1:])
+            self._reverse = (offsets, sources[order])
+        offsets, sources = self._reverse
+        starts = offsets[states]
+        lengths = offsets[states + 1] - starts
+        first = np.cumsum(lengths) - lengths
+        return sources[np.repeat(starts - first, lengths) + np.arange(lengths.sum())]
+
+    def _sweep_blocks(self, sweep, block_size=1 << 16):
+        """
+        Bloques de estados que se actualizan juntos en una pasada.
+
+        jacobi: un solo bloque con todos los estados. gauss-seidel: con la grilla conocida,
+        las dos clases del tablero de ajedrez (cada movimiento cambia de color, así cada clase
+        usa los valores recién calculados de la otra); sin grilla, bloques contiguos.
+        """
+        states = np.arange(self.num_states)
+        if sweep == 'jacobi':
+            return [states]
+        if sweep != 'gauss-seidel':
+            raise ValueError(f"Barrido no reconocido: {sweep}. Use: jacobi, gauss-seidel")
+        if self.n_cols is not None:
+            rows, cols = np.divmod(states, self.n_cols)
+            color = (rows + cols) % 2
+            return [states[color == 0], states[color == 1]]
+        return [states[i:i + block_size] for i in range(0, self.num_states, block_size)]
+
+    def _iterate(self, values, gamma, tol, max_iter, sweep, policy=None, pending=None):
+        """
+        Barridos de Bellman (máximo sobre acciones, o la acción de policy) en el lugar.
+
+        Sólo se recalculan los estados pendientes: al principio todos (o la máscara pending) y
+        después los predecesores de los que cambiaron más que tol. Un estado cuyos sucesores no cambiaron
+        daría el mismo backup, así que el resultado es el de los barridos completos con el
+        mismo criterio de corte, pero el trabajo sigue al frente de propagación en lugar de
+        tocar todo el mapa en cada pasada. Devuelve la cantidad de pasadas.
+        """
+        blocks = self._sweep_blocks(sweep)
+        pending = np.ones(self.num_states, dtype=bool) if pending is None else pending.copy()
+        iterations = 0
+        while iterations < max_iter and pending.any():
+            iterations += 1
+            for block in blocks:
+                states = block[pending[block]]
+                if states.size == 0:
+                    continue
+                pending[states] = False
+                if policy is None:
+                    updated = self._backup(self._rows(states), values, gamma).reshape(-1, self.num_actions).max(axis=1)
+                else:
+                    updated = self._backup(self._rows(states, policy[states]), values, gamma)
+                changed = states[np.abs(updated - values[states]) > tol]
+                values[states] = updated
+                pending[self._predecessors(changed)] = True
+        return iterations
+
+    def q_values(self, values, gamma=0.99):
+        """Q[s, a] para todos los estados a partir de values."""
+        rows = (self.offsets, self.targets, self.probs, self.rewards, self.continues)
+        return self._backup(rows, values, gamma).reshape(self.num_states, self.num_actions)
+
+    def greedy_policy(self, values, gamma=0.99):
+        return np.argmax(self.q_values(values, gamma), axis=1)
+
+    # --- planificación ---------------------------------------------------------------
+
+    def value_iteration(self, gamma=0.99, tol=1e-8, max_iter=100000, sweep='gauss-seidel'):
+        """
+        Iteración de valor vectorizada hasta que ningún estado cambie más que tol.
+        Devuelve (values, policy, pasadas).
+        """
+        values = np.zeros(self.num_states)
+        iterations = self._iterate(values, gamma, tol, max_iter, sweep)
+        return values, self.greedy_policy(values, gamma), iterations
+
+    def evaluate_policy(self, policy, gamma=0.99, tol=1e-8, max_iter=100000, sweep='gauss-seidel',
+                        values=None, changed=None):
+        """
+        V^pi por barridos iterativos (con 10^6 estados no se resuelve el sistema lineal).
+        Con values de una evaluación anterior, changed marca los estados cuya acción cambió:
+        el resto ya está en su punto fijo y sólo se recalcula si cambia algún sucesor.
+        """
+        values = np.zeros(self.num_states) if values is None else values.copy()
+        self._iterate(values, gamma, tol, max_iter, sweep, policy=np.asarray(policy), pending=changed)
+        return values
+
+    def policy_iteration(self, gamma=0.99, tol=1e-8, max_iter=1000, sweep='gauss-seidel'):
+        """
+        Iteración de política: evalúa, mejora en forma greedy y corta cuando la política no
+        cambia. Cada evaluación arranca de los valores anteriores. Devuelve (values, policy,
+        iteraciones).
+        """
+        policy = np.zeros(self.num_states, dtype=np.int64)
+        values = np.zeros(self.num_states)
+        all_states = np.arange(self.num_states)
+        changed = None
+        iterations = 0
+        for iterations in range(1, max_iter + 1):
+            values = self.evaluate_policy(policy, gamma, tol, sweep=sweep, values=values, changed=changed)
+            q = self.q_values(values, gamma)
+            improved = np.argmax(q, axis=1)
+            # Sólo se cambia la acción si mejora de verdad (evita ciclar entre empates)
+            improved = np.where(q[all_states, improved] > q[all_states, policy] + tol, improved, policy)
+            changed = improved != policy
+            if not changed.any():
+                break
+            policy = improved
+        return values, policy, iterations
+
+
+def solve(env, method='vi', gamma=0.99, tol=1e-8, sweep='gauss-seidel'):
+    """
+    Política óptima para env (determinista o resbaladizo). Usa P si el entorno lo trae ya
+    armado y la grilla si sólo expone el modelo compilado. Devuelve (policy, values, iteraciones).
+    """
+    unwrapped_env = getattr(env, 'unwrapped', env)
+    if isinstance(getattr(unwrapped_env, 'P', None), dict):
+        mdp = SparseMDP.from_env(env)
+    else:
+        _next_states, _terminal, _n_rows, _n_cols, description, _num_actions = _env_model(env)
+        mdp = SparseMDP.from_grid(description, slippery=False)
+
+    if method == 'vi':
+        values, policy, iterations = mdp.value_iteration(gamma, tol, sweep=sweep)
+    elif method == 'pi':
+        values, policy, iterations = mdp.policy_iteration(gamma, tol, sweep=sweep)
+    else:
+        raise ValueError(f"Método no reconocido: {method}. Use: vi, pi")
+    return policy, values, iterations
@@ -1,18 +1,23 @@
-import random 
+import random
+
+import numpy as np
+
+from algoritmos import _compile_grid
+
 
 def generate_random_map_custom(size: int = 8, p_frozen: float = 0.92, seed: int | None = None):
 
-    if seed is not None:
-        random.seed(seed)
+    # Generador local: mismos mapas que random.seed(seed) sin tocar el estado global
+    rng = random.Random(seed) if seed is not None else random
 
     # Generar grid con F/H
-    grid = [['F' if random.random() < p_frozen else 'H' for _ in range(size)] for _ in range(size)]
+    grid = [['F' if rng.random() < p_frozen else 'H' for _ in range(size)] for _ in range(size)]
 
     # Elegir posiciones aleatorias distintas para inicio y meta
     all_positions = [(i, j) for i in range(size) for j in range(size)]
-    start = random.choice(all_positions)
+    start = rng.choice(all_positions)
     all_positions.remove(start)
-    goal = random.choice(all_positions)
+    goal = rng.choice(all_positions)
 
     # Asignar S y G en la grilla
     grid[start[0]][start[1]] = 'S'
@@ -21,3 +26,153 @@ def generate_random_map_custom(size: int = 8, p_frozen: float = 0.92, seed: int
     # Convertir a lista de strings
     desc = ["".join(row) for row in grid]
     return desc
+
+
+def connected_components(free, stop_when=None):
+    """
+    Etiquetas de componentes 4-conexas de las celdas libres (-1 para bloqueadas).
+
+    Cada tramo horizontal de celdas libres ya es conexo, así que se numeran los tramos
+    (cumsum de sus inicios) y sólo se unen tramos vecinos por columna, con una arista por
+    solapamiento. Sobre los tramos corre un union-find vectorizado: en cada ronda cada
+    arista entre raíces distintas cuelga la mayor de la menor (np.minimum.at) y después se
+    saltan punteros (parent = parent[parent]) hasta que todos apuntan a su raíz; converge
+    en O(log n) rondas. La etiqueta de cada componente es la posición (entre las celdas
+    libres, en orden de filas) de su primera celda. Con una pila (k, filas, cols) etiqueta
+    cada grilla por separado en una sola pasada (las etiquetas no se repiten entre grillas).
+    stop_when=((fila, col), (fila, col)) corta apenas esas dos celdas comparten raíz (ya
+    se sabe que están conectadas).
+    """
+    cells = free.reshape(-1)
+    if not cells.any():
+        return np.full(free.shape, -1)
+
+    starts = free.copy()
+    starts[..., 1:] &= ~free[..., :-1]
+    run = np.cumsum(starts, dtype=np.int32).reshape(free.shape) - 1
+    # Dos celdas verticalmente libres seguidas unen los mismos dos tramos: basta la primera
+    vertical = free[..., :-1, :] & free[..., 1:, :]
+    vertical[..., 1:] &= ~vertical[..., :-1].copy()
+    first = run[..., :-1, :][vertical]
+    second = run[..., 1:, :][vertical]
+
+    if stop_when is not None:
+        stop_when = [run[cell] for cell in stop_when]
+
+    parent = np.arange(int(starts.sum()), dtype=np.int32)
+    while first.size:
+        first_root = parent[first]
+        second_root = parent[second]
+        pending = first_root != second_root
+        if not pending.any():
+            break
+        first, second = first[pending], second[pending]
+        first_root, second_root = first_root[pending], second_root[pending]
+        np.minimum.at(parent, np.maximum(first_root, second_root), np.minimum(first_root, second_root))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        if stop_when is not None and parent[stop_when[0]] == parent[stop_when[1]]:
+            break
+
+    first_cell = (np.cumsum(cells) - 1)[starts.reshape(-1)]
+    return np.where(free, first_cell[parent][run], -1)
+
+
+def generate_random_map_np(
+    size: int = 8,
+    p_frozen: float = 0.92,
+    rng: np.random.Generator | int | None = None,
+    ensure_path: bool = True,
+    max_tries: int = 20,
+):
+    """
+    Versión vectorizada de generate_random_map_custom sobre un np.random.Generator.
+
+    Sortea toda la grilla F/H de una vez y elige S y G distintas. Con ensure_path, si G no
+    es alcanzable desde S (componentes conexas) vuelve a sortear hasta max_tries veces y,
+    si aun así no lo es, talla un camino en L desde S hasta G.
+    Devuelve (desc, next_states, terminal): las strings para gym y la tabla compilada.
+    """
+    rng = np.random.default_rng(rng)
+
+    for attempt in range(max_tries if ensure_path else 1):
+        grid = np.where(rng.random((size, size)) < p_frozen, b'F', b'H').astype('S1')
+        start, goal = rng.choice(size * size, 2, replace=False)
+        start_rc, goal_rc = divmod(int(start), size), divmod(int(goal), size)
+        grid[start_rc] = b'S'
+        grid[goal_rc] = b'G'
+        if not ensure_path:
+            break
+        labels = connected_components(grid != b'H', stop_when=(start_rc, goal_rc))
+        if labels[start_rc] == labels[goal_rc]:
+            break
+    else:
+        # Tallar: fila de S hasta la columna de G y luego esa columna hasta G
+        (start_row, start_col), (goal_row, goal_col) = start_rc, goal_rc
+        row_slice = grid[start_row, min(start_col, goal_col):max(start_col, goal_col) + 1]
+        row_slice[row_slice == b'H'] = b'F'
+        col_slice = grid[min(start_row, goal_row):max(start_row, goal_row) + 1, goal_col]
+        col_slice[col_slice == b'H'] = b'F'
+
+    desc = [row.tobytes().decode() for row in grid]
+    next_states, terminal = _compile_grid(grid)
+    return desc, next_states, terminal
+
+
+def generate_random_maps_np(
+    count: int,
+    size: int = 8,
+    p_frozen: float = 0.92,
+    rng: np.random.Generator | int | None = None,
+    ensure_path: bool = True,
+    max_tries: int = 20,
+):
+    """
+    count mapas como los de generate_random_map_np, sorteados y etiquetados en lote.
+
+    Sortea las count grillas juntas y etiqueta la pila entera en una sola llamada a
+    connected_components; sólo se vuelven a sortear las que quedaron sin camino. Para
+    mapas chicos evita el costo fijo por mapa de las llamadas a NumPy. No reproduce los
+    mapas de generate_random_map_np con el mismo rng (consume el generador en otro orden).
+    Devuelve una lista de (desc, next_states, terminal).
+    """
+    rng = np.random.default_rng(rng)
+    num_cells = size * size
+    grids = np.empty((count, size, size), dtype='S1')
+    starts = np.empty(count, dtype=np.int64)
+    goals = np.empty(count, dtype=np.int64)
+
+    pending = np.arange(count)
+    for attempt in range(max_tries if ensure_path else 1):
+        batch = pending.size
+        grids[pending] = np.where(rng.random((batch, size, size)) < p_frozen, b'F', b'H')
+        # G uniforme entre las celdas distintas de S
+        starts[pending] = rng.integers(num_cells, size=batch)
+        goals[pending] = (starts[pending] + 1 + rng.integers(num_cells - 1, size=batch)) % num_cells
+        flat = grids.reshape(count, num_cells)
+        flat[pending, starts[pending]] = b'S'
+        flat[pending, goals[pending]] = b'G'
+        if not ensure_path:
+            break
+        labels = connected_components(grids[pending] != b'H').reshape(batch, num_cells)
+        rows = np.arange(batch)
+        pending = pending[labels[rows, starts[pending]] != labels[rows, goals[pending]]]
+        if not pending.size:
+            break
+    else:
+        for index in pending:
+            # Tallar: fila de S hasta la columna de G y luego esa columna hasta G
+            (start_row, start_col), (goal_row, goal_col) = divmod(int(starts[index]), size), divmod(int(goals[index]), size)
+            row_slice = grids[index, start_row, min(start_col, goal_col):max(start_col, goal_col) + 1]
+            row_slice[row_slice == b'H'] = b'F'
+            col_slice = grids[index, min(start_row, goal_row):max(start_row, goal_row) + 1, goal_col]
+            col_slice[col_slice == b'H'] = b'F'
+
+    maps = []
+    for grid in grids:
+        desc = [row.tobytes().decode() for row in grid]
+        maps.append((desc, *_compile_grid(grid)))
+    return maps
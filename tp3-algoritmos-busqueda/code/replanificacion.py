@@ -0,0 +1,163 @@
+import heapq
+
+import numpy as np
+
+from algoritmos import _env_model, _manhattan_heuristic, _normalize_start_goal, _step_cost
+
+# FrozenLake: 0 LEFT, 1 DOWN, 2 RIGHT, 3 UP
+_MOVES = ((0, -1), (1, 0), (0, 1), (-1, 0))
+_OPPOSITE = (2, 3, 0, 1)
+
+
+class LPAStarPlanner:
+    """
+    Lifelong Planning A* sobre la grilla de un FrozenLake cuyas celdas pueden cambiar.
+
+    Conserva g/rhs entre llamadas: update() recibe un lote de celdas editadas (agujero o
+    hielo), actualiza sólo los vértices cuyas aristas cambiaron y repara el árbol de
+    búsqueda. Cada llamada devuelve (acciones, expansiones de esa llamada), con el mismo
+    costo óptimo que ucs()/astar() sobre el mapa editado.
+    """
+
+    def __init__(self, env, start=None, goal=None, scenario=1):
+        model = _env_model(env)
+        if model is None:
+            raise ValueError("El entorno no expone un modelo de transiciones")
+        _next_states, _terminal, n_rows, n_cols, description, _num_actions = model
+        start_state, goal_state = _normalize_start_goal(env, start, goal, description, n_cols)
+        if start_state is None or goal_state is None:
+            raise ValueError("No se pudo determinar el inicio o la meta")
+
+        cells = np.asarray(description).reshape(-1)
+        hole = b'H' if cells.dtype.kind == 'S' else 'H'
+        self.walkable = (cells != hole).tolist()
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.start_state = start_state
+        self.goal_state = goal_state
+        self.scenario = scenario
+        self.heuristic = _manhattan_heuristic(goal_state, n_cols, scenario)
+        self._description = [list(row) for row in np.asarray(description).astype(str)]
+
+        self.g = {}
+        self.rhs = {start_state: 0}
+        self._queue = []
+        self._queued = {}
+        self._insert(start_state)
+        self.expanded_total = 0
+
+    @property
+    def desc(self):
+        """Descripción actual del mapa (con las ediciones aplicadas) como lista de strings."""
+        return ["".join(row) for row in self._description]
+
+    def _neighbors(self, state):
+        """Pares (action, vecino) dentro de la grilla."""
+        row, col = divmod(state, self.n_cols)
+        for action, (d_row, d_col) in enumerate(_MOVES):
+            n_row, n_col = row + d_row, col + d_col
+            if 0 <= n_row < self.n_rows and 0 <= n_col < self.n_cols:
+                yield action, n_row * self.n_cols + n_col
+
+    def _edge_cost(self, state, action, next_state):
+        # Los agujeros terminan el episodio y la meta no se abandona: no tienen aristas salientes
+        if not (self.walkable[state] and self.walkable[next_state]) or state == self.goal_state:
+            return None
+        return _step_cost(action, self.scenario)
+
+    def _key(self, state):
+        best = min(self.g.get(state, float('inf')), self.rhs.get(state, float('inf')))
+        return (best + self.heuristic(state), best)
+
+    def _insert(self, state):
+        key = self._key(state)
+        self._queued[state] = key
+        heapq.heappush(self._queue, (key[0], key[1], state))
+
+    def _top_key(self):
+        while self._queue:
+            k1, k2, state = self._queue[0]
+            if self._queued.get(state) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(self._queue)
+        return (float('inf'), float('inf'))
+
+    def _update_vertex(self, state):
+        if state != self.start_state:
+            best = float('inf')
+            for action, prev_state in self._neighbors(state):
+                # prev_state llega a state con la acción opuesta a la que va de state a prev_state
+                cost = self._edge_cost(prev_state, _OPPOSITE[action], state)
+                if cost is not None:
+                    best = min(best, self.g.get(prev_state, float('inf')) + cost)
+            self.rhs[state] = best
+        self._queued.pop(state, None)
+        if self.g.get(state, float('inf')) != self.rhs.get(state, float('inf')):
+            self._insert(state)
+
+    def _compute_shortest_path(self):
+        expanded = 0
+        goal_state = self.goal_state
+        while (self._top_key() < self._key(goal_state)
+               or self.rhs.get(goal_state, float('inf')) != self.g.get(goal_state, float('inf'))):
+            _k1, _k2, state = heapq.heappop(self._queue)
+            del self._queued[state]
+            expanded += 1
+            if self.g.get(state, float('inf')) > self.rhs.get(state, float('inf')):
+                self.g[state] = self.rhs[state]
+                for _action, next_state in self._neighbors(state):
+                    self._update_vertex(next_state)
+            else:
+                self.g[state] = float('inf')
+                self._update_vertex(state)
+                for _action, next_state in self._neighbors(state):
+                    self._update_vertex(next_state)
+        self.expanded_total += expanded
+        return expanded
+
+    def _extract_actions(self):
+        if self.g.get(self.goal_state, float('inf')) == float('inf'):
+            return []
+        actions = []
+        state = self.goal_state
+        while state != self.start_state:
+            remaining = self.g[state]
+            for action, prev_state in self._neighbors(state):
+                cost = self._edge_cost(prev_state, _OPPOSITE[action], state)
+                if cost is not None and self.g.get(prev_state, float('inf')) + cost == remaining:
+                    actions.append(_OPPOSITE[action])
+                    state = prev_state
+                    break
+        actions.reverse()
+        return actions
+
+    def plan(self):
+        """Resuelve (o confirma) el camino actual. Devuelve (acciones, expansiones)."""
+        expanded = self._compute_shortest_path()
+        return self._extract_actions(), expanded
+
+    def update(self, edits):
+        """
+        Aplica un lote de ediciones {(fila, col): 'H' | 'F'} y replanifica.
+
+        Sólo se actualizan la celda editada y sus vecinos, que son los extremos de las
+        aristas cuyo costo cambió.
+        """
+        touched = set()
+        for (row, col), cell in dict(edits).items():
+            state = row * self.n_cols + col
+            if state in (self.start_state, self.goal_state):
+                raise ValueError("No se puede editar la celda de inicio ni la meta")
+            if cell not in ('H', 'F'):
+                raise ValueError(f"Celda no reconocida: {cell}. Use: H, F")
+            walkable = cell != 'H'
+            if self.walkable[state] == walkable:
+                continue
+            self.walkable[state] = walkable
+            self._description[row][col] = cell
+            touched.add(state)
+            touched.update(next_state for _action, next_state in self._neighbors(state))
+
+        for state in touched:
+            self._update_vertex(state)
+        return self.plan()
@@ -0,0 +1,155 @@
+import numpy as np
+
+from algoritmos import _env_model, _normalize_start_goal
+
+# FrozenLake: desplazamiento (fila, columna) de 0 LEFT, 1 DOWN, 2 RIGHT, 3 UP
+_MOVES = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)], dtype=np.int64)
+
+
+def random_walks(env, num_walkers=100000, max_steps=1000, seed=None, start=None):
+    """
+    Simula num_walkers episodios de política aleatoria a la vez sobre la tabla compilada
+    (FrozenLake determinista).
+
+    Cada paso es un único gather next_states[estado, acción] para los caminantes que siguen
+    activos; el episodio termina al caer en un agujero, al llegar a la meta o a los
+    max_steps pasos (el mismo corte que el TimeLimit de make_env). Con seed la simulación es
+    reproducible.
+
+    Devuelve (steps, cost_e2, reached_goal, fell_in_hole), arreglos de largo num_walkers;
+    el costo del escenario 1 es steps.
+    """
+    model = _env_model(env)
+    if model is None:
+        raise ValueError("El entorno no expone un modelo de transiciones")
+    next_states, terminal, _n_rows, n_cols, description, num_actions = model
+    start_state, goal_state = _normalize_start_goal(env, start, None, description, n_cols)
+    if start_state is None:
+        raise ValueError("No se pudo determinar el inicio")
+
+    rng = np.random.default_rng(seed)
+    # FrozenLake: 0 LEFT, 1 DOWN, 2 RIGHT, 3 UP (escenario 2: L/R cuestan 1 y U/D 10)
+    action_cost = np.array([1 if action in (0, 2) else 10 for action in range(num_actions)], dtype=np.int64)
+
+    states = np.full(num_walkers, start_state, dtype=np.int64)
+    steps = np.zeros(num_walkers, dtype=np.int64)
+    cost_e2 = np.zeros(num_walkers, dtype=np.int64)
+    active = np.arange(num_walkers) if not terminal[start_state] else np.arange(0)
+
+    for _ in range(max_steps):
+        if active.size == 0:
+            break
+        actions = rng.integers(num_actions, size=active.size)
+        moved = next_states[states[active], actions]
+        states[active] = moved
+        steps[active] += 1
+        cost_e2[active] += action_cost[actions]
+        active = active[~terminal[moved]]
+
+    reached_goal = states == goal_state if goal_state is not None else np.zeros(num_walkers, dtype=bool)
+    fell_in_hole = terminal[states] & ~reached_goal
+    return steps, cost_e2, reached_goal, fell_in_hole
+
+
+def summarize_walks(steps, cost_e2, reached_goal, fell_in_hole):
+    """Tasa de éxito/agujero/corte y cuantiles de costo (de los episodios exitosos) por escenario."""
+    summary = {
+        "episodes": int(steps.size),
+        "success_rate": float(reached_goal.mean()),
+        "hole_rate": float(fell_in_hole.mean()),
+        "truncated_rate": float((~reached_goal & ~fell_in_hole).mean()),
+    }
+    for name, cost in (("cost_e1", steps), ("cost_e2", cost_e2)):
+        successful = cost[reached_goal]
+        if successful.size:
+            p50, p90, p99 = np.percentile(successful, [50, 90, 99])
+            summary[name] = {"mean": float(successful.mean()), "p50": float(p50),
+                             "p90": float(p90), "p99": float(p99)}
+        else:
+            summary[name] = None
+    return summary
+
+
+def is_deterministic(env):
+    """True si las acciones desde el inicio tienen una sola transición (FrozenLake sin is_slippery)."""
+    model = _env_model(env)
+    if model is None:
+        return False
+    _next_states, _terminal, _n_rows, n_cols, description, num_actions = model
+    start_state, _goal_state = _normalize_start_goal(env, None, None, description, n_cols)
+    transitions_model = getattr(env, 'unwrapped', env).P
+    state = start_state if start_state is not None else 0
+    return all(len(transitions_model[state][action]) == 1 for action in range(num_actions))
+
+
+def _episode_limit(env):
+    """Pasos máximos del episodio: max_steps de GridEnv o el TimeLimit de gymnasium."""
+    for attribute in ('max_steps', '_max_episode_steps'):
+        limit = getattr(env, attribute, None)
+        if limit is not None:
+            return limit
+    return None
+
+
+def validate_path(env, actions, start=None, max_steps=None, chunk_size=4096):
+    """
+    Recorre actions sobre la tabla compilada sin llamar a env.step (FrozenLake determinista).
+
+    Las posiciones salen de la suma acumulada de los desplazamientos de cada acción y se
+    confirman con un solo gather next_states[anterior, acción] por tramo. Sólo un choque
+    contra el borde (la acción deja al agente en su celda) corta el tramo: se toma el estado
+    real de la tabla y se sigue desde ahí. Como env.step, el recorrido termina en el primer
+    agujero o meta, o a los max_steps pasos (por defecto, el límite del entorno).
+
+    Devuelve (final_state, steps, hole_index, success, cost_e1, cost_e2): hole_index es el
+    índice de la acción que cae en un agujero (None si no cae) y los costos son los de
+    _step_cost sobre los steps pasos ejecutados.
+    """
+    model = _env_model(env)
+    if model is None:
+        raise ValueError("El entorno no expone un modelo de transiciones")
+    next_states, terminal, n_rows, n_cols, description, _num_actions = model
+    start_state, goal_state = _normalize_start_goal(env, start, None, description, n_cols)
+    if start_state is None:
+        raise ValueError("No se pudo determinar el inicio")
+
+    actions = np.asarray(actions, dtype=np.int64).reshape(-1)
+    limit = max_steps if max_steps is not None else _episode_limit(env)
+    if limit is not None:
+        actions = actions[:limit]
+
+    states = np.empty(actions.size, dtype=np.int64)  # estado después de cada acción
+    position = start_state
+    done = 0
+    steps = 0 if terminal[start_state] else None
+    while steps is None and done < actions.size:
+        segment = actions[done:done + chunk_size]
+        row, col = divmod(position, n_cols)
+        path = np.cumsum(_MOVES[segment], axis=0) + (row, col)
+        inside = (path[:, 0] >= 0) & (path[:, 0] < n_rows) & (path[:, 1] >= 0) & (path[:, 1] < n_cols)
+        predicted = np.where(inside, path[:, 0] * n_cols + path[:, 1], -1)
+        previous = np.concatenate(([position], predicted[:-1]))
+        # Los índices -1 leen la última fila, pero sólo importa el primer desvío
+        confirmed = inside & (next_states[previous, segment] == predicted)
+        mismatches = np.flatnonzero(~confirmed)
+        valid = mismatches[0] if mismatches.size else segment.size
+        states[done:done + valid] = predicted[:valid]
+        if valid < segment.size:
+            position = int(next_states[previous[valid], segment[valid]])
+            states[done + valid] = position
+            valid += 1
+        else:
+            position = int(predicted[-1])
+        stops = np.flatnonzero(terminal[states[done:done + valid]])
+        if stops.size:
+            steps = done + int(stops[0]) + 1
+        done += valid
+    if steps is None:
+        steps = actions.size
+
+    final_state = int(states[steps - 1]) if steps else start_state
+    success = goal_state is not None and final_state == goal_state
+    hole_index = steps - 1 if steps and terminal[final_state] and not success else None
+    executed = actions[:steps]
+    cost_e2 = int(np.where((executed == 0) | (executed == 2), 1, 10).sum())
+    return final_state, steps, hole_index, success, steps, cost_e2
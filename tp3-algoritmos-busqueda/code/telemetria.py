@@ -0,0 +1,112 @@
+import json
+import time
+import tracemalloc
+
+import algoritmos
+
+
+class SearchTelemetry:
+    """
+    Contadores de una corrida de búsqueda, llenados por las funciones de algoritmos.py
+    mientras algoritmos._TELEMETRY apunta a esta instancia.
+
+    - expanded: nodos sacados de la frontera y expandidos (coincide con el contador que
+      devuelve cada búsqueda).
+    - generated: sucesores que entraron a la frontera (nuevos o con mejor costo).
+    - duplicates: sucesores descartados por ya vistos o sin mejorar el costo.
+    - stale_pops: entradas viejas de la cola de prioridad descartadas al sacarlas.
+    - frontier_peak / closed_peak: tamaño máximo de la frontera y del conjunto de estados
+      ya vistos (lo que cada algoritmo guarda: visitados, best_cost, camino actual, ...).
+    - phases: segundos por fase (model, setup, search, reconstruct).
+    """
+
+    def __init__(self, trace_memory=False):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.stale_pops = 0
+        self.frontier_peak = 0
+        self.closed_peak = 0
+        self.phases = {}
+        self.trace_memory = trace_memory
+        self.memory_peak = None
+        self.elapsed = None
+        self._started = time.perf_counter()
+        self._last_mark = self._started
+        self._previous = None
+
+    def expand(self, frontier_size, closed_size, count=1):
+        self.expanded += count
+        if frontier_size > self.frontier_peak:
+            self.frontier_peak = frontier_size
+        if closed_size > self.closed_peak:
+            self.closed_peak = closed_size
+
+    def mark(self, phase):
+        """Cierra la fase phase con el tiempo transcurrido desde la marca anterior."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last_mark
+        self._last_mark = now
+
+
+def start(trace_memory=False):
+    """
+    Activa la telemetría para las búsquedas que se llamen hasta stop().
+
+    trace_memory activa tracemalloc para medir el pico de memoria asignada; hace más lenta
+    la corrida, así que esos tiempos no son comparables con los de una corrida sin memoria.
+    """
+    telemetry = SearchTelemetry(trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+    telemetry._previous = algoritmos._TELEMETRY
+    algoritmos._TELEMETRY = telemetry
+    telemetry._started = telemetry._last_mark = time.perf_counter()
+    return telemetry
+
+
+def stop(telemetry):
+    """Desactiva la telemetría; lo que quedó después de la última marca cuenta como reconstruct."""
+    telemetry.mark('reconstruct')
+    telemetry.elapsed = time.perf_counter() - telemetry._started
+    algoritmos._TELEMETRY = telemetry._previous
+    if telemetry.trace_memory:
+        _current, telemetry.memory_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return telemetry
+
+
+def record(algorithm, telemetry, actions, expanded, extra=None):
+    """Registro estructurado (un dict por corrida) listo para to_json_line."""
+    data = {
+        "algorithm": algorithm,
+        "solution_found": bool(actions),
+        "actions_count": len(actions),
+        "expanded": expanded,
+        "generated": telemetry.generated,
+        "duplicates": telemetry.duplicates,
+        "stale_pops": telemetry.stale_pops,
+        "frontier_peak": telemetry.frontier_peak,
+        "closed_peak": telemetry.closed_peak,
+        "memory_peak": telemetry.memory_peak,
+        "time": telemetry.elapsed,
+        "time_per_expansion": telemetry.elapsed / expanded if expanded and telemetry.elapsed is not None else None,
+        "phases": telemetry.phases,
+    }
+    if extra:
+        data.update(extra)
+    return data
+
+
+def run(algorithm, search, env, *args, trace_memory=False, extra=None, **kwargs):
+    """Corre search(env, *args, **kwargs) instrumentada. Devuelve (actions, expanded, registro)."""
+    telemetry = start(trace_memory)
+    try:
+        actions, expanded = search(env, *args, **kwargs)
+    finally:
+        stop(telemetry)
+    return actions, expanded, record(algorithm, telemetry, actions, expanded, extra)
+
+
+def to_json_line(data):
+    return json.dumps(data, ensure_ascii=False, sort_keys=True)
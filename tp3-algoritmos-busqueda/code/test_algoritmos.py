@@ -0,0 +1,207 @@
+import numpy as np
+
+import algoritmos
+import telemetria
+from algoritmos import _BucketFrontier, _env_model, _step_cost, astar, sma_star, ucs
+from distancias import DistanceFieldCache, LandmarkTable
+from grilla import GridEnv
+from jerarquico import hpa_star
+from randomCustom import generate_random_map_custom
+from replanificacion import LPAStarPlanner
+from simulacion import validate_path
+
+# 8x8 sin agujeros: el camino óptimo tiene 14 pasos (15 nodos con la raíz)
+ABIERTO = ["SFFFFFFF"] + ["FFFFFFFF"] * 6 + ["FFFFFFFG"]
+
+# G encerrada: la componente de S tiene 60 celdas
+ENCERRADA = [
+    "SFFFFFFF",
+    "FFFFFFFF",
+    "FFFFFFFF",
+    "FFFFFFFF",
+    "FFFFFFFF",
+    "FFFFFFFF",
+    "FFFFFFHH",
+    "FFFFFFHG",
+]
+
+
+def test_sma_star_sin_memoria_para_el_camino_devuelve_vacio():
+    env = GridEnv(ABIERTO)
+    for max_nodes in (1, 4, 10, 14):
+        actions, _expanded = sma_star(env, None, None, max_nodes=max_nodes)
+        assert actions == []
+
+
+def test_sma_star_con_memoria_suficiente_es_optimo():
+    env = GridEnv(ABIERTO)
+    for max_nodes in (15, 1000):
+        actions, _expanded = sma_star(env, None, None, max_nodes=max_nodes)
+        assert len(actions) == 14
+    optimal, _expanded = astar(env, None, None, scenario=2)
+    actions, _expanded = sma_star(env, None, None, scenario=2, max_nodes=20)
+    assert sum(_step_cost(a, 2) for a in actions) == sum(_step_cost(a, 2) for a in optimal)
+
+
+def test_sma_star_sin_camino_devuelve_vacio():
+    env = GridEnv(ENCERRADA)
+    for max_nodes in (4, 10, 1000):
+        actions, _expanded = sma_star(env, None, None, max_nodes=max_nodes)
+        assert actions == []
+
+
+def _cost(actions, scenario=1):
+    return sum(_step_cost(action, scenario) for action in actions)
+
+
+def test_bucket_frontier_con_prioridades_no_monotonas():
+    frontier = _BucketFrontier()
+    frontier.push((5, "a"))
+    assert frontier.pop() == (5, "a")
+    frontier.push((3, "b"))
+    frontier.push((7, "c"))
+    assert frontier.pop() == (3, "b")
+    assert frontier.pop() == (7, "c")
+    assert len(frontier) == 0
+
+
+def test_astar_con_heuristica_inconsistente_en_baldes():
+    # Admisible pero no consistente: Manhattan en las columnas pares y 0 en las impares
+    for seed in range(3):
+        env = GridEnv(generate_random_map_custom(12, 0.8, seed))
+        for scenario in (1, 2):
+            for goal in range(0, 144, 7):
+                goal_row, goal_col = divmod(goal, 12)
+
+                def heuristic(state):
+                    row, col = divmod(state, 12)
+                    if col % 2:
+                        return 0
+                    return abs(col - goal_col) + abs(row - goal_row) * (1 if scenario == 1 else 10)
+
+                optimal, _expanded = ucs(env, None, goal, scenario=scenario)
+                actions, _expanded = astar(env, None, goal, scenario=scenario, frontier='bucket',
+                                           heuristic=heuristic)
+                assert _cost(actions, scenario) == _cost(optimal, scenario)
+
+
+def test_alt_es_consistente_y_optimo():
+    for seed in range(4):
+        env = GridEnv(generate_random_map_custom(12, 0.65, seed))
+        next_states = _env_model(env)[0]
+        for scenario in (1, 2):
+            table = LandmarkTable.build(env, scenario, k=2)
+            for goal in range(0, 144, 11):
+                heuristic = table.heuristic(env, goal=goal)
+                for state, successors in enumerate(next_states.tolist()):
+                    for action, next_state in enumerate(successors):
+                        if next_state != state:
+                            assert heuristic(state) <= _step_cost(action, scenario) + heuristic(next_state)
+                for start in range(3, 144, 17):
+                    optimal, _expanded = astar(env, start, goal, scenario=scenario)
+                    actions, _expanded = astar(env, start, goal, scenario=scenario, heuristic=heuristic)
+                    assert _cost(actions, scenario) == _cost(optimal, scenario)
+
+
+def test_hpa_star_acotado_por_astar():
+    # HPA* es subóptimo: sólo se exige que encuentre camino cuando astar lo encuentra, que
+    # no sea mejor que el óptimo y que no se aleje demasiado en estos mapas
+    for seed in range(15):
+        for size, p_frozen in ((16, 0.8), (33, 0.9)):
+            env = GridEnv(generate_random_map_custom(size, p_frozen, seed))
+            for scenario in (1, 2):
+                optimal, _expanded = astar(env, None, None, scenario=scenario)
+                for cluster_size in (2, 4, 8):
+                    actions, _expanded = hpa_star(env, None, None, scenario=scenario, cluster_size=cluster_size)
+                    assert bool(actions) == bool(optimal)
+                    assert _cost(optimal, scenario) <= _cost(actions, scenario) <= 1.5 * _cost(optimal, scenario)
+
+
+# Búsquedas óptimas en costo por escenario (las de pasos sólo lo son en el escenario 1)
+OPTIMAS = ["ucs", "astar", "ara_star", "beam_search", "bidirectional_astar", "ida_star", "sma_star"]
+OPTIMAS_EN_PASOS = ["bfs", "bfs_vectorized", "jps", "bidirectional_bfs"]
+COMPLETAS = OPTIMAS + OPTIMAS_EN_PASOS + ["dfs"]
+
+
+def _mapas_chicos():
+    for seed in range(6):
+        for p_frozen in (0.8, 0.65):
+            yield GridEnv(generate_random_map_custom(10, p_frozen, seed))
+
+
+def _assert_llega(env, actions):
+    goal = int(np.flatnonzero(env.desc.reshape(-1) == b'G')[0])
+    final_state, steps, hole_index, success, _cost_e1, _cost_e2 = validate_path(env, actions)
+    assert success and final_state == goal and hole_index is None and steps == len(actions)
+
+
+def test_fronteras_dan_el_mismo_costo():
+    for env in _mapas_chicos():
+        for scenario in (1, 2):
+            optimal, _expanded = ucs(env, None, None, scenario=scenario, frontier='heap')
+            for search in (ucs, astar):
+                for frontier in ('heap', 'bucket'):
+                    for compact in (False, True):
+                        actions, _expanded = search(env, None, None, scenario=scenario,
+                                                    compact=compact, frontier=frontier)
+                        assert _cost(actions, scenario) == _cost(optimal, scenario)
+
+
+def test_todas_las_busquedas_devuelven_caminos_validos():
+    for env in _mapas_chicos():
+        optimal, _expanded = astar(env, None, None)
+        for name in COMPLETAS + ["random_search", "dls"]:
+            actions, _expanded = getattr(algoritmos, name)(env, None, None)
+            if name in COMPLETAS:
+                assert bool(actions) == bool(optimal), name
+            if actions:
+                _assert_llega(env, actions)
+            if name in OPTIMAS + OPTIMAS_EN_PASOS:
+                assert len(actions) == len(optimal), name
+        for extra in (hpa_star(env, None, None, cluster_size=4)[0], DistanceFieldCache().query(env)[0],
+                      LPAStarPlanner(env).plan()[0]):
+            assert bool(extra) == bool(optimal)
+            if extra:
+                _assert_llega(env, extra)
+
+
+def test_busquedas_optimas_en_escenario_2():
+    cache = DistanceFieldCache()
+    for env in _mapas_chicos():
+        optimal, _expanded = astar(env, None, None, scenario=2)
+        for name in OPTIMAS:
+            actions, _expanded = getattr(algoritmos, name)(env, None, None, scenario=2)
+            assert _cost(actions, 2) == _cost(optimal, 2), name
+        assert _cost(cache.query(env, scenario=2)[0], 2) == _cost(optimal, 2)
+        assert _cost(LPAStarPlanner(env, scenario=2).plan()[0], 2) == _cost(optimal, 2)
+
+
+def test_lpa_star_replanifica_como_astar():
+    for seed in range(6):
+        env = GridEnv(generate_random_map_custom(12, 0.8, seed))
+        for scenario in (1, 2):
+            planner = LPAStarPlanner(env, scenario=scenario)
+            planner.plan()
+            rng = np.random.default_rng(seed)
+            for _round in range(5):
+                edits = {}
+                for state in rng.choice(144, 6, replace=False).tolist():
+                    if state not in (planner.start_state, planner.goal_state):
+                        edits[divmod(state, 12)] = 'H' if rng.random() < 0.6 else 'F'
+                actions, _expanded = planner.update(edits)
+                edited = GridEnv(planner.desc)
+                optimal, _expanded = astar(edited, None, None, scenario=scenario)
+                assert _cost(actions, scenario) == _cost(optimal, scenario)
+                if actions:
+                    _assert_llega(edited, actions)
+
+
+def test_hpa_star_informa_telemetria():
+    for seed in range(6):
+        env = GridEnv(generate_random_map_custom(33, 0.8, seed))
+        telemetry = telemetria.start()
+        _actions, expanded = hpa_star(env, None, None, scenario=2, cluster_size=4)
+        telemetria.stop(telemetry)
+        assert telemetry.expanded == expanded > 0
+        assert telemetry.generated > 0 and telemetry.closed_peak > 0
+        assert {'setup', 'search'} <= set(telemetry.phases)
@@ -2,13 +2,17 @@
 import argparse
 import os
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 
 import reinas
 
 
+ALGORITHMS = ["random", "HC", "SHC", "SA", "GA", "MC"]
+DEFAULT_ALGORITHMS = ["random", "HC", "SA", "GA"]
+
+
 def run_algorithms(
     size: int,
     max_states: int,
@@ -16,44 +20,65 @@ def run_algorithms(
     population: int,
     generations: int,
     mutation: float,
+    algorithms: Optional[List[str]] = None,
 ) -> Dict[str, Tuple[List[int], List[int], float, int]]:
     results: Dict[str, Tuple[List[int], List[int], float, int]] = {}
-
-    history: List[int] = []
-    start = time.perf_counter()
-    best, h_value, states = reinas.random_search(size, max_states, seed=seed, history=history)
-    elapsed = time.perf_counter() - start
-    results["random"] = (history.copy(), best, elapsed, states)
-
-    history = []
-    start = time.perf_counter()
-    best, h_value, states = reinas.hill_climbing(size, max_states, seed=seed, history=history)
-    elapsed = time.perf_counter() - start
-    results["HC"] = (history.copy(), best, elapsed, states)
-
-    history = []
-    start = time.perf_counter()
-    best, h_value, states = reinas.simulated_annealing(
-        size,
-        max_states,
-        seed=seed,
-        history=history,
-    )
-    elapsed = time.perf_counter() - start
-    results["SA"] = (history.copy(), best, elapsed, states)
-
-    history = []
-    start = time.perf_counter()
-    best, h_value, states = reinas.genetic_algorithm(
-        size,
-        tam_poblacion=population,
-        limite_generaciones=generations,
-        tasa_mutacion=mutation,
-        seed=seed,
-        history=history,
-    )
-    elapsed = time.perf_counter() - start
-    results["GA"] = (history.copy(), best, elapsed, states)
+    if algorithms is None:
+        algorithms = DEFAULT_ALGORITHMS
+
+    if "random" in algorithms:
+        history: List[int] = []
+        start = time.perf_counter()
+        best, h_value, states = reinas.random_search(size, max_states, seed=seed, history=history)
+        elapsed = time.perf_counter() - start
+        results["random"] = (history.copy(), best, elapsed, states)
+
+    if "HC" in algorithms:
+        history = []
+        start = time.perf_counter()
+        best, h_value, states = reinas.hill_climbing(size, max_states, seed=seed, history=history)
+        elapsed = time.perf_counter() - start
+        results["HC"] = (history.copy(), best, elapsed, states)
+
+    if "SHC" in algorithms:
+        history = []
+        start = time.perf_counter()
+        best, h_value, states = reinas.steepest_hill_climbing(size, max_states, seed=seed, history=history)
+        elapsed = time.perf_counter() - start
+        results["SHC"] = (history.copy(), best, elapsed, states)
+
+    if "SA" in algorithms:
+        history = []
+        start = time.perf_counter()
+        best, h_value, states = reinas.simulated_annealing(
+            size,
+            max_states,
+            seed=seed,
+            history=history,
+        )
+        elapsed = time.perf_counter() - start
+        results["SA"] = (history.copy(), best, elapsed, states)
+
+    if "GA" in algorithms:
+        history = []
+        start = time.perf_counter()
+        best, h_value, states = reinas.genetic_algorithm(
+            size,
+            tam_poblacion=population,
+            limite_generaciones=generations,
+            tasa_mutacion=mutation,
+            seed=seed,
+            history=history,
+        )
+        elapsed = time.perf_counter() - start
+        results["GA"] = (history.copy(), best, elapsed, states)
+
+    if "MC" in algorithms:
+        history = []
+        start = time.perf_counter()
+        best, h_value, states = reinas.min_conflicts(size, max_states, seed=seed, history=history)
+        elapsed = time.perf_counter() - start
+        results["MC"] = (history.copy(), best, elapsed, states)
 
     return results
 
@@ -92,6 +117,13 @@ def main() -> None:
     parser.add_argument("--population", type=int, default=100, help="Tamaño de población para GA")
     parser.add_argument("--generations", type=int, default=200, help="Límite de generaciones para GA")
     parser.add_argument("--mutation", type=float, default=0.25, help="Tasa de mutación para GA")
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=ALGORITHMS,
+        default=DEFAULT_ALGORITHMS,
+        help="Algoritmos a correr (SHC = hill climbing de máximo descenso, MC = min-conflicts)",
+    )
     parser.add_argument("--output", default="plots", help="Directorio de salida para las gráficas")
     parser.add_argument(
         "--combined",
@@ -118,6 +150,7 @@ def main() -> None:
         population=args.population,
         generations=args.generations,
         mutation=args.mutation,
+        algorithms=args.algorithms,
     )
 
     combined_fig = None
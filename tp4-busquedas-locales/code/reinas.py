@@ -1,8 +1,9 @@
 import math
 import random
-from collections import Counter
 from typing import List, Optional, Tuple
 
+import numpy as np
+
 def generar_estado(n: int, seed: Optional[int] = None) -> List[int]:
     """Genera un tablero aleatorio para el problema de las n reinas."""
 
@@ -18,26 +19,75 @@ def pairs(n: int) -> int:
 
 
 def h(tablero: List[int]) -> int:
-
-    n = len(tablero)
-    if n <= 1:
-        return 0
-
-    # Contar amenazas por filas
-    por_fila = Counter(tablero)
-    amenazas_fila = sum(pairs(cnt) for cnt in por_fila.values())
-
-    # Contar amenazas por diagonales: fila - columna y fila + columna
-    diag_principal = Counter()
-    diag_secundaria = Counter()
-    for col, fila in enumerate(tablero):
-        diag_principal[fila - col] += 1
-        diag_secundaria[fila + col] += 1
-
-    amenazas_diag_principal = sum(pairs(cnt) for cnt in diag_principal.values())
-    amenazas_diag_secundaria = sum(pairs(cnt) for cnt in diag_secundaria.values())
-
-    return amenazas_fila + amenazas_diag_principal + amenazas_diag_secundaria
+    """Pares de reinas que se atacan (misma fila o diagonal), contados con TableroConflictos."""
+    return TableroConflictos(tablero).h
+
+
+class TableroConflictos:
+    """
+    Tablero con la ocupación de filas, diagonales principales (fila - columna) y
+    secundarias (fila + columna) en arreglos de contadores.
+
+    h se mantiene al día: delta(col, fila) da el cambio de h al mover la reina de col a
+    fila en O(1) y mover() aplica ese movimiento en el lugar, sin copiar el tablero ni
+    recontar con h().
+    """
+
+    def __init__(self, tablero: List[int]):
+        n = len(tablero)
+        self.n = n
+        self.tablero = list(tablero)
+        self.por_fila = [0] * n
+        # Desplazadas en n - 1 para que fila - columna sea un índice no negativo
+        self.diag_principal = [0] * max(2 * n - 1, 0)
+        self.diag_secundaria = [0] * max(2 * n - 1, 0)
+        for col, fila in enumerate(self.tablero):
+            self.por_fila[fila] += 1
+            self.diag_principal[fila - col + n - 1] += 1
+            self.diag_secundaria[fila + col] += 1
+        # pairs(cnt) sumado sobre filas y diagonales
+        self.h = (
+            sum(cnt * (cnt - 1) for cnt in self.por_fila)
+            + sum(cnt * (cnt - 1) for cnt in self.diag_principal)
+            + sum(cnt * (cnt - 1) for cnt in self.diag_secundaria)
+        ) // 2
+
+    def conflictos(self, col: int, fila: int) -> int:
+        """Reinas de otras columnas que atacarían a una reina en (fila, col)."""
+        total = (
+            self.por_fila[fila]
+            + self.diag_principal[fila - col + self.n - 1]
+            + self.diag_secundaria[fila + col]
+        )
+        if self.tablero[col] == fila:
+            total -= 3
+        return total
+
+    def delta(self, col: int, fila: int) -> int:
+        """Cambio de h al mover la reina de la columna col a fila."""
+        actual = self.tablero[col]
+        if fila == actual:
+            return 0
+        # La reina que se mueve sale de sus tres líneas y no comparte ninguna con la nueva casilla
+        return self.conflictos(col, fila) - self.conflictos(col, actual)
+
+    def mover(self, col: int, fila: int) -> int:
+        """Mueve la reina de col a fila, actualiza h y devuelve el delta aplicado."""
+        cambio = self.delta(col, fila)
+        actual = self.tablero[col]
+        n1 = self.n - 1
+        self.por_fila[actual] -= 1
+        self.diag_principal[actual - col + n1] -= 1
+        self.diag_secundaria[actual + col] -= 1
+        self.por_fila[fila] += 1
+        self.diag_principal[fila - col + n1] += 1
+        self.diag_secundaria[fila + col] += 1
+        self.tablero[col] = fila
+        self.h += cambio
+        return cambio
+
+    def estado(self) -> List[int]:
+        return list(self.tablero)
 
 
 def hill_climbing(
@@ -55,9 +105,8 @@ def hill_climbing(
     if n == 0:
         return [], 0, 0
 
-    tablero_inicial = generar_estado(n, seed)
-    mejorTablero = list(tablero_inicial)
-    mejor_h = h(mejorTablero)
+    tablero = TableroConflictos(generar_estado(n, seed))
+    mejor_h = tablero.h
     evaluaciones = 0
 
     if history is not None:
@@ -65,28 +114,107 @@ def hill_climbing(
         history.append(mejor_h)
 
     if limite_estados == 0:
-        return mejorTablero, mejor_h, evaluaciones
+        return tablero.estado(), mejor_h, evaluaciones
 
     for col in range(n):
         for fila in range(n):
-            if fila == mejorTablero[col]:
+            if fila == tablero.tablero[col]:
                 continue
-            candidato = mejorTablero.copy()
-            candidato[col] = fila
-            valor = h(candidato)
+            delta = tablero.delta(col, fila)
             evaluaciones += 1
 
-            if valor < mejor_h:
-                mejorTablero = candidato
-                mejor_h = valor
+            if delta < 0:
+                tablero.mover(col, fila)
+                mejor_h = tablero.h
 
             if history is not None:
                 history.append(mejor_h)
 
             if evaluaciones >= limite_estados:
-                return mejorTablero, mejor_h, evaluaciones
+                return tablero.estado(), mejor_h, evaluaciones
+
+    return tablero.estado(), mejor_h, evaluaciones
+
+
+def steepest_hill_climbing(
+    n: int,
+    limite_estados: int,
+    seed: Optional[int] = None,
+    history: Optional[List[int]] = None,
+    max_laterales: int = 100,
+) -> Tuple[List[int], int, int]:
+    """
+    Hill climbing de máximo descenso de h: en cada paso evalúa los n * (n - 1) vecinos
+    (mover una reina dentro de su columna) con una matriz de deltas n x n calculada en una
+    sola pasada de NumPy sobre los contadores de filas y diagonales, y toma el mejor (al azar
+    entre empates). Acepta movimientos laterales (delta 0) hasta max_laterales seguidos; en
+    un mínimo local reinicia desde un tablero al azar.
 
-    return mejorTablero, mejor_h, evaluaciones
+    Arranca del mismo tablero que hill_climbing para la misma seed. Cada paso cuenta
+    n * (n - 1) evaluaciones y no se empieza un paso que pase limite_estados.
+    """
+
+    if n < 0:
+        raise ValueError("n debe ser no negativo")
+    if limite_estados < 0:
+        raise ValueError("limite_estados debe ser no negativo")
+    if max_laterales < 0:
+        raise ValueError("max_laterales debe ser no negativo")
+
+    if n == 0:
+        return [], 0, 0
+
+    # Mismo generador que generar_estado(n, seed): el primer tablero coincide con el de hill_climbing
+    rng = random.Random(seed) if seed is not None else random
+    vecinos = n * (n - 1)
+    filas = np.arange(n)
+    # Índices [columna, fila] de la diagonal principal y secundaria de cada casilla
+    indice_principal = filas[None, :] - filas[:, None] + n - 1
+    indice_secundaria = filas[None, :] + filas[:, None]
+    no_vecino = np.iinfo(np.int64).max
+
+    tablero = np.array([rng.randrange(n) for _ in range(n)], dtype=np.int64)
+    valor = h(tablero.tolist())
+    mejor = tablero.tolist()
+    mejor_valor = valor
+    laterales = 0
+    evaluaciones = 0
+
+    if history is not None:
+        history.clear()
+        history.append(valor)
+
+    while mejor_valor > 0 and evaluaciones + vecinos <= limite_estados:
+        por_fila = np.bincount(tablero, minlength=n)
+        diag_principal = np.bincount(tablero - filas + n - 1, minlength=2 * n - 1)
+        diag_secundaria = np.bincount(tablero + filas, minlength=2 * n - 1)
+        # costos[col, fila]: reinas que atacarían a la reina de col si estuviera en fila
+        costos = por_fila[None, :] + diag_principal[indice_principal] + diag_secundaria[indice_secundaria]
+        actuales = costos[filas, tablero] - 3
+        deltas = costos - actuales[:, None]
+        deltas[filas, tablero] = no_vecino
+        evaluaciones += vecinos
+
+        mejor_delta = int(deltas.min())
+        if mejor_delta > 0 or (mejor_delta == 0 and laterales >= max_laterales):
+            tablero = np.array([rng.randrange(n) for _ in range(n)], dtype=np.int64)
+            valor = h(tablero.tolist())
+            laterales = 0
+        else:
+            empates = np.flatnonzero(deltas.ravel() == mejor_delta)
+            col, fila = divmod(int(empates[rng.randrange(empates.size)]), n)
+            tablero[col] = fila
+            valor += mejor_delta
+            laterales = laterales + 1 if mejor_delta == 0 else 0
+
+        if valor < mejor_valor:
+            mejor = tablero.tolist()
+            mejor_valor = valor
+
+        if history is not None:
+            history.append(valor)
+
+    return mejor, mejor_valor, evaluaciones
 
 
 def simulated_annealing(
@@ -117,9 +245,9 @@ def simulated_annealing(
 
     rng = random.Random(seed) if seed is not None else random
 
-    actual = generar_estado(n, seed)
-    mejor = list(actual)
-    valor_actual = h(actual)
+    actual = TableroConflictos(generar_estado(n, seed))
+    mejor = actual.estado()
+    valor_actual = actual.h
     mejor_valor = valor_actual
     temperatura = max(temperatura_inicial, temperatura_minima)
     evaluaciones = 0
@@ -137,19 +265,15 @@ def simulated_annealing(
         and mejor_valor > 0
     ):
         columna = rng.randrange(n)
-        fila_actual = actual[columna]
+        fila_actual = actual.tablero[columna]
 
         fila_candidata = rng.randrange(n)
         if fila_candidata == fila_actual:
             fila_candidata = (fila_candidata + 1) % n
 
-        candidato = actual.copy()
-        candidato[columna] = fila_candidata
-        valor_candidato = h(candidato)
+        delta = actual.delta(columna, fila_candidata)
         evaluaciones += 1
 
-        delta = valor_candidato - valor_actual
-
         aceptar = False
         if delta <= 0:
             aceptar = True
@@ -159,10 +283,10 @@ def simulated_annealing(
                 aceptar = True
 
         if aceptar:
-            actual = candidato
-            valor_actual = valor_candidato
+            actual.mover(columna, fila_candidata)
+            valor_actual = actual.h
             if valor_actual < mejor_valor:
-                mejor = actual
+                mejor = actual.estado()
                 mejor_valor = valor_actual
 
         if history is not None:
@@ -328,6 +452,163 @@ def random_search(
     return mejor_tablero, mejor_valor, evaluaciones
 
 
+def _colocacion_voraz(n: int, rng, intentos: int = 128) -> List[int]:
+    """
+    Tablero inicial con pocos conflictos: parte de una permutación al azar (sin conflictos
+    de fila) y, columna por columna, si la fila que le tocó comparte diagonal con las ya
+    colocadas prueba hasta intentos filas todavía libres al azar y se queda con la primera
+    sin conflicto (o con la última probada).
+    """
+    filas = list(range(n))
+    rng.shuffle(filas)
+    # Sólo importa si la diagonal está ocupada; los conflictos se cuentan después
+    diag_principal = bytearray(max(2 * n - 1, 0))
+    diag_secundaria = bytearray(max(2 * n - 1, 0))
+    aleatorio = rng.random
+    desplazamiento = n - 1
+    for col in range(n):
+        fila = filas[col]
+        principal = fila - col + desplazamiento
+        secundaria = fila + col
+        if diag_principal[principal] or diag_secundaria[secundaria]:
+            restantes = n - col
+            for _ in range(intentos):
+                j = col + int(aleatorio() * restantes)
+                fila = filas[j]
+                principal = fila - col + desplazamiento
+                secundaria = fila + col
+                if not diag_principal[principal] and not diag_secundaria[secundaria]:
+                    break
+            filas[col], filas[j] = fila, filas[col]
+        diag_principal[principal] = 1
+        diag_secundaria[secundaria] = 1
+    return filas
+
+
+def min_conflicts(
+    n: int,
+    limite_estados: int,
+    seed: Optional[int] = None,
+    history: Optional[List[int]] = None,
+    reinicio_sin_mejora: int = 200,
+) -> Tuple[List[int], int, int]:
+    """
+    Min-conflicts: desde una colocación voraz con pocos conflictos, elige al azar una columna
+    en conflicto y mueve su reina a la fila con menos conflictos (al azar entre empates,
+    evitando quedarse en la misma fila si hay otra igual de buena).
+
+    Los conflictos de todas las filas de la columna salen de los contadores de filas y
+    diagonales en una sola pasada de NumPy. Las columnas en conflicto se guardan en una
+    lista para elegir en O(1); las que dejaron de estarlo se sacan al elegirlas. Cada paso
+    cuenta n - 1 evaluaciones (los vecinos de esa columna), como hill_climbing. Si h no
+    mejora en reinicio_sin_mejora pasos se reinicia con otra colocación voraz.
+    """
+
+    if n < 0:
+        raise ValueError("n debe ser no negativo")
+    if limite_estados < 0:
+        raise ValueError("limite_estados debe ser no negativo")
+    if reinicio_sin_mejora <= 0:
+        raise ValueError("reinicio_sin_mejora debe ser positivo")
+
+    if n == 0:
+        return [], 0, 0
+
+    rng = random.Random(seed) if seed is not None else random
+
+    columnas = np.arange(n)
+    desplazamiento = n - 1
+    mejor: List[int] = []
+    mejor_valor = math.inf
+    evaluaciones = 0
+
+    if history is not None:
+        history.clear()
+
+    while True:
+        tablero = np.array(_colocacion_voraz(n, rng), dtype=np.int64)
+        # int32 alcanza para los contadores y hace más rápida la pasada por columna
+        por_fila = np.bincount(tablero, minlength=n).astype(np.int32)
+        diag_principal = np.bincount(tablero - columnas + desplazamiento, minlength=2 * n - 1).astype(np.int32)
+        diag_secundaria = np.bincount(tablero + columnas, minlength=2 * n - 1).astype(np.int32)
+        valor = int(
+            (por_fila.astype(np.int64) * (por_fila - 1)).sum()
+            + (diag_principal.astype(np.int64) * (diag_principal - 1)).sum()
+            + (diag_secundaria.astype(np.int64) * (diag_secundaria - 1)).sum()
+        ) // 2
+        conflictos = (
+            por_fila[tablero]
+            + diag_principal[tablero - columnas + desplazamiento]
+            + diag_secundaria[tablero + columnas]
+            - 3
+        )
+        pendientes = np.flatnonzero(conflictos > 0).tolist()
+        en_pendientes = conflictos > 0
+        sin_mejora = 0
+
+        if history is not None:
+            history.append(valor)
+
+        while valor > 0 and sin_mejora < reinicio_sin_mejora and evaluaciones + n - 1 <= limite_estados:
+            indice = rng.randrange(len(pendientes))
+            col = pendientes[indice]
+            fila = int(tablero[col])
+            if por_fila[fila] + diag_principal[fila - col + desplazamiento] + diag_secundaria[fila + col] == 3:
+                pendientes[indice] = pendientes[-1]
+                pendientes.pop()
+                en_pendientes[col] = False
+                continue
+
+            # Con las filas en orden, las diagonales de la columna son tramos contiguos
+            costos = (
+                por_fila
+                + diag_principal[desplazamiento - col:desplazamiento - col + n]
+                + diag_secundaria[col:col + n]
+            )
+            costos[fila] -= 3
+            evaluaciones += n - 1
+
+            minimo = int(costos.min())
+            empates = np.flatnonzero(costos == minimo)
+            if empates.size > 1:
+                empates = empates[empates != fila]
+            nueva = int(empates[rng.randrange(empates.size)])
+            delta = minimo - int(costos[fila])
+
+            if nueva != fila:
+                por_fila[fila] -= 1
+                diag_principal[fila - col + desplazamiento] -= 1
+                diag_secundaria[fila + col] -= 1
+                por_fila[nueva] += 1
+                diag_principal[nueva - col + desplazamiento] += 1
+                diag_secundaria[nueva + col] += 1
+                tablero[col] = nueva
+                valor += delta
+                if minimo > 0:
+                    # La reina movida ataca a otras: pasan a estar en conflicto
+                    atacadas = np.flatnonzero(
+                        (tablero == nueva)
+                        | (tablero - columnas == nueva - col)
+                        | (tablero + columnas == nueva + col)
+                    )
+                    atacadas = atacadas[~en_pendientes[atacadas]]
+                    en_pendientes[atacadas] = True
+                    pendientes.extend(atacadas.tolist())
+
+            sin_mejora = 0 if delta < 0 else sin_mejora + 1
+            if history is not None:
+                history.append(valor)
+
+        # Cada paso mueve a la fila de menos conflictos, así que h nunca sube dentro de una corrida
+        if valor < mejor_valor:
+            mejor = tablero.tolist()
+            mejor_valor = valor
+        if mejor_valor == 0 or evaluaciones + n - 1 > limite_estados:
+            break
+
+    return mejor, mejor_valor, evaluaciones
+
+
 
 
 